@@ -3,8 +3,10 @@
 #Author: Youri Rigaud
 #License: MIT License
 
-from tests.knn_tests import compare_knn_classifier, compare_knn_regressor
-from tests.linear_model_tests import compare_ols
+from tests.knn_tests import compare_knn_classifier, compare_knn_regressor, compare_knn_metrics, compare_knn_compression, compare_knn_cache
+from tests.linear_model_tests import compare_ols, compare_ols_online
+from tests.preprocessing_tests import compare_scalers, compare_pipeline
+from tests.dataset_tests import compare_dataset
 
 def main():
     """
@@ -12,7 +14,14 @@ def main():
     """
     assert compare_knn_classifier(), "KNN classifier does not perform as well!"
     assert compare_knn_regressor(), "KNN regressor does not perform as well!"
+    assert compare_knn_metrics(), "KNN metrics do not perform as well!"
+    assert compare_knn_compression(), "KNN compression does not perform as well!"
+    assert compare_knn_cache(), "KNN cache does not perform as well!"
     assert compare_ols(), "OLS regressor does not perform as well!"
+    assert compare_ols_online(), "OLS online regressor does not perform as well!"
+    assert compare_scalers(), "Scalers do not perform as well!"
+    assert compare_pipeline(), "Pipelines do not perform as well!"
+    assert compare_dataset(), "Dataset does not perform as well!"
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""Test the Dataset container of ylearn."""
+
+#Author: Youri Rigaud
+#License : MIT License
+
+import numpy as np
+from sklearn.datasets import load_diabetes
+from sklearn.model_selection import train_test_split
+
+from ylearn import Dataset
+from ylearn.linear_model import OLS, Ridge
+from ylearn.neighbors import KNNRegressor
+
+def compare_dataset() -> bool:
+    """
+    Compare the estimators fitted on a Dataset with the ones fitted on the ArrayLike,
+    and check that the cached factorizations are shared and invalidated on mutation.
+
+    Returns:
+        bool: True if the predictions are the same and the caches behave as expected.
+    """
+    print("Test Dataset")
+    # Load diabetes dataset from sklearn (Regression)
+    X, y = load_diabetes(return_X_y=True)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, random_state=0)
+    # the Dataset does not copy X_train, so it is mutated with the Dataset
+    dataset = Dataset(X_train.copy())
+
+    # the same estimators fitted on the Dataset and on the ArrayLike
+    same_pred = True
+    for estimator_type, params in [(OLS, {}), (OLS, {"solver": "normal"}), (Ridge, {}), (Ridge, {"solver": "normal"}), (KNNRegressor, {"k": 5})]:
+        y_pred_dataset = estimator_type(**params).fit(dataset, y_train).predict(X_test)
+        y_pred_array = estimator_type(**params).fit(X_train, y_train).predict(X_test)
+        same_pred = same_pred and np.allclose(y_pred_dataset, y_pred_array)
+    print(f"Same predictions: {same_pred}")
+
+    # the QR factorization is computed once for OLS and Ridge
+    design = dataset.with_intercept()
+    Q, _ = design.qr()
+    OLS().fit(dataset, y_train)
+    Ridge().fit(dataset, y_train)
+    shared = design.qr()[0] is Q and dataset.with_intercept() is design
+    print(f"Shared factorizations: {shared}")
+
+    # mutation through the Dataset invalidates the caches
+    dataset[0, 0] = 1.
+    invalidated = dataset.with_intercept() is not design and dataset.with_intercept().X[0, 1] == 1.
+    print(f"Invalidated caches: {invalidated}")
+
+    # a KNN estimator fitted on the Dataset sees the mutation
+    knn = KNNRegressor(k=5, cache_size=len(X_test)).fit(dataset, y_train)
+    knn.predict(X_test)
+    X_mutated = X_train[::-1].copy()
+    dataset[:, :] = X_mutated
+    knn_mutated = np.allclose(knn.predict(X_test), KNNRegressor(k=5).fit(X_mutated, y_train).predict(X_test))
+    print(f"KNN follows the mutation: {knn_mutated}")
+    return same_pred and shared and invalidated and knn_mutated
@@ -3,6 +3,7 @@
 #Author: Youri Rigaud
 #License : MIT License
 
+import numpy as np
 from sklearn.datasets import load_breast_cancer, load_diabetes
 from sklearn.model_selection import train_test_split
 from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
@@ -11,6 +12,7 @@ from sklearn.metrics import mean_squared_error
 from ylearn.neighbors import KNNClassifier
 from ylearn.neighbors import KNNRegressor
 from ylearn.metrics import MSE
+from ylearn.utils import euclidean_distance
 
 def compare_knn_classifier() -> bool:
     """
@@ -64,3 +66,104 @@ def compare_knn_regressor() -> bool:
     sklearn_r2 = sklearn_clf.score(X_test, y_test)
     print(f"R2 score: ylearn: {ylearn_r2}; sklearn: {sklearn_r2}")
     return ylearn_r2 == sklearn_r2 and ylearn_MSE == sklearn_MSE
+
+def compare_knn_metrics() -> bool:
+    """
+    Compare the KNN classifier model of ylearn with the one from sklearn for each distance metric.
+
+    Returns:
+        bool: True if the ylearn model is as accurate than the sklearn one for every metric and the invalid parameters are rejected.
+    """
+    print("Test KNN metrics")
+    # Load breast cancer dataset from sklearn (Classification)
+    X, y = load_breast_cancer(return_X_y=True)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, random_state=0)
+
+    metrics = [
+        ("euclidean", {}, "euclidean", {}),
+        ("sqeuclidean", {}, "sqeuclidean", {}),
+        ("manhattan", {}, "manhattan", {}),
+        ("minkowski", {"p": 3}, "minkowski", {"p": 3}),
+        ("cosine", {}, "cosine", {}),
+        (euclidean_distance, {}, "euclidean", {}),
+    ]
+    same_accuracy = True
+    for ylearn_metric, ylearn_params, sklearn_metric, sklearn_params in metrics:
+        # ylearn estimator, small blocks to test the blocked computation
+        ylearn_clf = KNNClassifier(k=5, metric=ylearn_metric, metric_params=ylearn_params, block_size=16).fit(X_train, y_train)
+
+        # sklearn estimator
+        sklearn_clf = KNeighborsClassifier(n_neighbors=5, metric=sklearn_metric, **sklearn_params).fit(X_train, y_train)
+
+        ylearn_accuracy = ylearn_clf.score(X_test, y_test)
+        sklearn_accuracy = sklearn_clf.score(X_test, y_test)
+        print(f"Accuracy ({sklearn_metric}): ylearn: {ylearn_accuracy}; sklearn: {sklearn_accuracy}")
+        same_accuracy = same_accuracy and ylearn_accuracy == sklearn_accuracy
+
+    # the metric parameters are rejected with a callable, they would be silently ignored
+    try:
+        KNNClassifier(k=5, metric=euclidean_distance, metric_params={"p": 3})
+        raise_params = False
+    except ValueError:
+        raise_params = True
+    print(f"Metric parameters of a callable rejected: {raise_params}")
+    return same_accuracy and raise_params
+
+def compare_knn_compression() -> bool:
+    """
+    Compare the KNN classifier model of ylearn with product quantization compression with the one from sklearn.
+
+    Returns:
+        bool: True if the re-ranked compressed model is as accurate than the sklearn one and the codes are smaller than the data.
+    """
+    print("Test KNN compression")
+    # Load breast cancer dataset from sklearn (Classification)
+    X, y = load_breast_cancer(return_X_y=True)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, random_state=0)
+    pq_params = {"n_subspaces": 10, "random_state": 0}
+
+    # ylearn estimators, without and with re-ranking of a shortlist
+    ylearn_pq = KNNClassifier(k=5, compression="pq", compression_params=pq_params).fit(X_train, y_train)
+    ylearn_rerank = KNNClassifier(k=5, compression="pq", compression_params=pq_params, rerank=50).fit(X_train, y_train)
+
+    # sklearn estimator
+    sklearn_clf = KNeighborsClassifier(n_neighbors=5).fit(X_train, y_train)
+
+    footprint = ylearn_pq.memory_footprint()
+    print(f"Memory: codes: {footprint['codes']} bytes; codebooks: {footprint['codebooks']} bytes; raw: {X_train.nbytes} bytes")
+    print(f"Recall: pq: {ylearn_pq.compression_recall(X_test, X_train)}; pq re-ranked: {ylearn_rerank.compression_recall(X_test)}")
+    ylearn_pq_accuracy = ylearn_pq.score(X_test, y_test)
+    ylearn_rerank_accuracy = ylearn_rerank.score(X_test, y_test)
+    sklearn_accuracy = sklearn_clf.score(X_test, y_test)
+    print(f"Accuracy: ylearn pq: {ylearn_pq_accuracy}; ylearn pq re-ranked: {ylearn_rerank_accuracy}; sklearn: {sklearn_accuracy}")
+    return ylearn_rerank_accuracy == sklearn_accuracy and footprint["codes"] < X_train.nbytes
+
+def compare_knn_cache() -> bool:
+    """
+    Compare the KNN regressor model of ylearn with a prediction cache with the one from sklearn on repeated queries.
+
+    Returns:
+        bool: True if the cached predictions are the same than the sklearn ones and the repeated queries hit the cache.
+    """
+    print("Test KNN cache")
+    # Load diabetes dataset from sklearn (Regressor)
+    X, y = load_diabetes(return_X_y=True)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, random_state=0)
+    X_repeated = np.vstack([X_test, X_test[:50]])
+
+    # ylearn estimator, the second predict only hits the cache
+    ylearn_clf = KNNRegressor(k=5, cache_size=len(X_test)).fit(X_train, y_train)
+    ylearn_clf.predict(X_repeated)
+    y_pred_ylearn = ylearn_clf.predict(X_repeated)
+    info = ylearn_clf.cache_info()
+    print(f"Cache: hits: {info['hits']}; misses: {info['misses']}; entries: {info['entries']}")
+
+    # sklearn estimator
+    sklearn_clf = KNeighborsRegressor(n_neighbors=5).fit(X_train, y_train)
+    y_pred_sklearn = sklearn_clf.predict(X_repeated)
+
+    y_repeated = np.concatenate([y_test, y_test[:50]])
+    ylearn_MSE = MSE(y_repeated, y_pred_ylearn)
+    sklearn_MSE = mean_squared_error(y_repeated, y_pred_sklearn)
+    print(f"MSE: ylearn: {ylearn_MSE}; sklearn: {sklearn_MSE}")
+    return ylearn_MSE == sklearn_MSE and info["hits"] == len(X_repeated) and info["misses"] == len(X_repeated)
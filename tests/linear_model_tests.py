@@ -3,12 +3,14 @@
 #Author: Youri Rigaud
 #License : MIT License
 
+import numpy as np
 from sklearn.datasets import load_diabetes
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error
 
 from ylearn.linear_model import OLS
+from ylearn.preprocessing import Pipeline, StandardScaler
 from ylearn.metrics import MSE
 
 def compare_ols() -> bool:
@@ -37,4 +39,61 @@ def compare_ols() -> bool:
     ylearn_r2 = ylearn_clf.score(X_test, y_test)
     sklearn_r2 = sklearn_clf.score(X_test, y_test)
     print(f"R2 score: ylearn: {ylearn_r2}; sklearn: {sklearn_r2}")
-    return ylearn_r2 == sklearn_r2 and ylearn_MSE == sklearn_MSE
\ No newline at end of file
+    return ylearn_r2 == sklearn_r2 and ylearn_MSE == sklearn_MSE
+
+def compare_ols_online() -> bool:
+    """
+    Compare the OLS model of ylearn updated online with the one from sklearn fitted on all the data,
+    the OLS model of ylearn updated online with a window with the one from sklearn fitted on the window,
+    the OLS model of ylearn folded in a Pipeline and updated online with the one from sklearn fitted on all the data,
+    and the OLS models of ylearn updated online with a forgetting factor over thousands of observations with a weighted least squares.
+
+    Returns:
+        bool: True if the coefficients of the ylearn models are close to the sklearn ones.
+    """
+    print("Test OLS online")
+    # Load diabetes dataset from sklearn (Regression)
+    X, y = load_diabetes(return_X_y=True)
+
+    # ylearn estimators, fitted on the first samples then updated with the others
+    ylearn_clf = OLS().fit(X[:200], y[:200])
+    for x_i, y_i in zip(X[200:300], y[200:300]):
+        ylearn_clf.update(x_i, y_i)
+    ylearn_clf.update_batch(X[300:], y[300:])
+    ylearn_window = OLS(window=150).fit(X[:200], y[:200]).update_batch(X[200:], y[200:])
+    ylearn_pipeline = Pipeline(StandardScaler(), OLS()).fit(X[:300], y[:300])
+    ylearn_pipeline.estimator.update_batch(X[300:], y[300:])
+
+    # sklearn estimators
+    sklearn_clf = LinearRegression().fit(X, y)
+    sklearn_window = LinearRegression().fit(X[-150:], y[-150:])
+
+    close = np.allclose(ylearn_clf.coef_, sklearn_clf.coef_) and np.allclose(ylearn_clf.intercept_, sklearn_clf.intercept_)
+    close_window = np.allclose(ylearn_window.coef_, sklearn_window.coef_) and np.allclose(ylearn_window.intercept_, sklearn_window.intercept_)
+    close_pipeline = np.allclose(ylearn_pipeline.predict(X), sklearn_clf.predict(X))
+    # forgetting factor on random data, the observation i of n is weighted by forgetting^(n-1-i)
+    rng = np.random.default_rng(0)
+    X_drift = rng.normal(size=(5000, 5))
+    y_drift = X_drift @ rng.normal(size=5) + rng.normal(size=5000)
+    close_forgetting = True
+    for forgetting in [0.95, 0.8]:
+        ylearn_row = OLS(forgetting=forgetting).fit(X_drift[:100], y_drift[:100])
+        for x_i, y_i in zip(X_drift[100:], y_drift[100:]):
+            ylearn_row.update(x_i, y_i)
+        ylearn_batch = OLS(forgetting=forgetting).fit(X_drift[:100], y_drift[:100]).update_batch(X_drift[100:], y_drift[100:])
+        sqrt_weights = np.sqrt(forgetting ** np.arange(4999, -1, -1))
+        Z_drift = np.hstack([np.ones((5000, 1)), X_drift]) * sqrt_weights[:, np.newaxis]
+        beta = np.linalg.lstsq(Z_drift, y_drift * sqrt_weights, rcond=None)[0]
+        for ylearn_drift in [ylearn_row, ylearn_batch]:
+            close_forgetting &= np.allclose(ylearn_drift.coef_, beta[1:]) and np.allclose(ylearn_drift.intercept_, beta[0])
+
+    # a window smaller than the number of coefficients is rejected
+    try:
+        OLS(window=10).fit(X[:200], y[:200]).update(X[200], y[200])
+        raise_window = False
+    except ValueError:
+        raise_window = True
+
+    print(f"Coefficients close to sklearn: online: {close}; online window: {close_window}; online pipeline: {close_pipeline}; online forgetting: {close_forgetting}")
+    print(f"Too small window rejected: {raise_window}")
+    return close and close_window and close_pipeline and close_forgetting and raise_window
@@ -0,0 +1,82 @@
+"""Test the preprocessing of ylearn and compare it with sklearn."""
+
+#Author: Youri Rigaud
+#License : MIT License
+
+import numpy as np
+from sklearn.datasets import load_diabetes
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler as SklearnStandardScaler, MinMaxScaler as SklearnMinMaxScaler
+from sklearn.neighbors import KNeighborsRegressor
+
+from ylearn import Dataset
+from ylearn.preprocessing import StandardScaler, MinMaxScaler, Pipeline
+from ylearn.linear_model import Ridge
+from ylearn.neighbors import KNNRegressor
+
+def compare_scalers() -> bool:
+    """
+    Compare the scalers of ylearn fitted by chunks with the ones from sklearn fitted on the whole data.
+
+    Returns:
+        bool: True if the scaled data of ylearn are close to the sklearn ones.
+    """
+    print("Test scalers")
+    # Load diabetes dataset from sklearn
+    X, _ = load_diabetes(return_X_y=True)
+    chunks = np.array_split(X, 4)
+
+    same_data = True
+    for ylearn_scaler_type, sklearn_scaler in [(StandardScaler, SklearnStandardScaler()), (MinMaxScaler, SklearnMinMaxScaler())]:
+        # ylearn scaler, half of the chunks in a streaming way and the other half merged
+        ylearn_scaler = ylearn_scaler_type().partial_fit(chunks[0]).partial_fit(chunks[1])
+        other_scaler = ylearn_scaler_type().partial_fit(chunks[2]).partial_fit(chunks[3])
+        ylearn_scaler.merge(other_scaler)
+        X_ylearn = ylearn_scaler.transform(X)
+
+        # sklearn scaler
+        X_sklearn = sklearn_scaler.fit_transform(X)
+
+        close = np.allclose(X_ylearn, X_sklearn) and np.allclose(ylearn_scaler.inverse_transform(X_ylearn), X)
+        print(f"{ylearn_scaler_type.__name__} close to sklearn: {close}")
+        same_data = same_data and close
+    return same_data
+
+def compare_pipeline() -> bool:
+    """
+    Compare the pipeline of ylearn for a linear model with the unfolded model,
+    the pipeline of ylearn for a KNN model with the one from sklearn,
+    and the pipeline of ylearn scaling the Dataset queries in place with the one from sklearn.
+
+    Returns:
+        bool: True if the ylearn pipelines are as accurate than the sklearn ones.
+    """
+    print("Test pipeline")
+    # Load diabetes dataset from sklearn (Regression)
+    X, y = load_diabetes(return_X_y=True)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, random_state=0)
+
+    # linear model, the scaler is folded into the coefficients
+    # compared with the same ylearn model fitted on the scaled data, sklearn Ridge does not penalize the intercept
+    scaler = StandardScaler().fit(X_train)
+    ylearn_ridge = Pipeline(StandardScaler(), Ridge(lmbd=10.)).fit(X_train, y_train)
+    unfolded_ridge = Ridge(lmbd=10.).fit(scaler.transform(X_train), y_train)
+    ylearn_r2 = ylearn_ridge.score(X_test, y_test)
+    unfolded_r2 = unfolded_ridge.score(scaler.transform(X_test), y_test)
+    print(f"Ridge R2 score: folded: {ylearn_r2}; unfolded: {unfolded_r2}")
+    same_ridge = ylearn_ridge.folded_ and np.allclose(ylearn_ridge.predict(X_test), unfolded_ridge.predict(scaler.transform(X_test)))
+
+    # KNN model, the training data is scaled once
+    ylearn_knn = Pipeline(StandardScaler(), KNNRegressor(k=5)).fit(X_train, y_train)
+    sklearn_knn = make_pipeline(SklearnStandardScaler(), KNeighborsRegressor(n_neighbors=5)).fit(X_train, y_train)
+    ylearn_r2 = ylearn_knn.score(X_test, y_test)
+    sklearn_r2 = sklearn_knn.score(X_test, y_test)
+    print(f"KNN R2 score: ylearn: {ylearn_r2}; sklearn: {sklearn_r2}")
+    same_knn = np.allclose(ylearn_r2, sklearn_r2)
+
+    # KNN model on Datasets, the queries are scaled in place through the Dataset
+    ylearn_inplace = Pipeline(StandardScaler(), KNNRegressor(k=5), copy=False).fit(Dataset(X_train), y_train)
+    same_inplace = np.allclose(ylearn_inplace.predict(Dataset(X_test.copy())), sklearn_knn.predict(X_test))
+    print(f"KNN in place on Datasets same as sklearn: {same_inplace}")
+    return same_ridge and same_knn and same_inplace
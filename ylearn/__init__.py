@@ -1,4 +1,6 @@
 """Base configuration for the library."""
 
 # Author: Youri Rigaud
-# License: MIT License
\ No newline at end of file
+# License: MIT License
+
+from ylearn.dataset import Dataset
\ No newline at end of file
@@ -5,8 +5,10 @@
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from typing import Union
 
 from .types import ArrayLike
+from ylearn.dataset import Dataset
 from ylearn.metrics import r2_score
 
 class BaseEstimator(ABC):
@@ -15,12 +17,13 @@ class BaseEstimator(ABC):
     """
     
     @abstractmethod
-    def fit(self, X_train: ArrayLike, y_train: ArrayLike) -> BaseEstimator:
+    def fit(self, X_train: Union[ArrayLike, Dataset], y_train: ArrayLike) -> BaseEstimator:
         """
         Train the estimator on data X to fit target values y.
+        Given a Dataset, the derived quantities cached on it are reused across estimators.
 
         Parameters:
-            X_train (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the training data.
+            X_train (ArrayLike | Dataset): A (nb_samples, nb_features) shape ArrayLike or Dataset representing the training data.
             y_train (ArrayLike): A (nb_samples, ) shape ArrayLike representing the target values of the training data.
         
         Returns:
@@ -29,12 +32,12 @@ class BaseEstimator(ABC):
         pass
     
     @abstractmethod
-    def predict(self, X: ArrayLike) -> ArrayLike:
+    def predict(self, X: Union[ArrayLike, Dataset]) -> ArrayLike:
         """
         Predict the target values of the data X.
 
         Parameters:
-            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike representing the queries data.
+            X (ArrayLike | Dataset): A (nb_queries, nb_features) shape ArrayLike or Dataset representing the queries data.
         
         Returns:
             y_pred (ArrayLike): The target values predicted by the estimator.
@@ -0,0 +1,200 @@
+"""Module for the dataset container shared by the estimators."""
+
+#Author: Youri Rigaud
+#License: MIT License
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, Tuple, Union
+import numpy as np
+
+from ylearn.types import ArrayLike
+
+class Dataset:
+    """
+    Container of a (nb_samples, nb_features) data matrix, validated once as a C-contiguous float64 ArrayLike.
+    The expensive derived quantities (row norms, column statistics, Gram matrix, QR and Cholesky factors)
+    are computed lazily and cached, so every estimator fitted on the same Dataset reuses them.
+    The caches are invalidated when the data is mutated through the Dataset.
+    If the original ArrayLike is mutated directly, call invalidate.
+
+    Attributes:
+        version (int): The number of invalidations, estimators compare it to detect a mutation since their fit.
+    """
+
+    def __init__(self, X: Union[ArrayLike, Dataset]) -> None:
+        """
+        Initialize the dataset, X is copied only if it is not a C-contiguous float64 ArrayLike.
+
+        Parameters:
+            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the data.
+        """
+        if isinstance(X, Dataset):
+            X = X.X
+        X = np.ascontiguousarray(X, dtype=float)
+        if X.ndim != 2:
+            raise ValueError(f"Dataset expects a (nb_samples, nb_features) shape ArrayLike, got {X.shape}.")
+        # read only view, the mutations must go through __setitem__ to invalidate the caches
+        self._X = X.view()
+        self._X.flags.writeable = False
+        self._cache: Dict[Any, Any] = {}
+        self.version = 0
+
+    @classmethod
+    def wrap(cls, X: Union[ArrayLike, Dataset]) -> Dataset:
+        """
+        Get X as a Dataset, without creating a new one if it is already a Dataset.
+
+        Parameters:
+            X (ArrayLike | Dataset): A (nb_samples, nb_features) shape ArrayLike or a Dataset.
+
+        Returns:
+            dataset (Dataset): The Dataset of X.
+        """
+        return X if isinstance(X, Dataset) else cls(X)
+
+    @property
+    def X(self) -> ArrayLike:
+        """
+        The read only (nb_samples, nb_features) shape data.
+        """
+        return self._X
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """
+        The (nb_samples, nb_features) shape of the data.
+        """
+        return self._X.shape
+
+    def __len__(self) -> int:
+        """
+        The number of samples.
+        """
+        return self._X.shape[0]
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> ArrayLike:
+        """
+        Convert the dataset to a numpy ArrayLike, without copy if the dtype is already the float64 of the data.
+        """
+        X = self._X if dtype is None or np.dtype(dtype) == self._X.dtype else self._X.astype(dtype)
+        return X.copy() if copy and X is self._X else X
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        """
+        Mutate the data and invalidate the caches.
+
+        Parameters:
+            key (Any): The numpy index of the values to set.
+            value (Any): The new values.
+        """
+        self._X.flags.writeable = True
+        try:
+            self._X[key] = value
+        finally:
+            self._X.flags.writeable = False
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """
+        Clear all the cached quantities.
+        """
+        self._cache.clear()
+        self.version += 1
+
+    def _cached(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """
+        Get a cached quantity, compute it on the first call.
+
+        Parameters:
+            key (Any): The key of the quantity in the cache.
+            compute (Callable): The function computing the quantity.
+
+        Returns:
+            value (Any): The cached quantity.
+        """
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def with_intercept(self) -> Dataset:
+        """
+        Get the dataset with an intercept column of ones at the first column, cached with its own factorizations.
+
+        Returns:
+            dataset (Dataset): A (nb_samples, nb_features+1) shape Dataset.
+        """
+        return self._cached("with_intercept", lambda: Dataset(np.hstack([np.ones((self._X.shape[0], 1)), self._X])))
+
+    def row_sq_norms(self) -> ArrayLike:
+        """
+        Get the squared norms of the rows.
+
+        Returns:
+            sq_norms (ArrayLike): A (nb_samples, ) shape ArrayLike.
+        """
+        return self._cached("row_sq_norms", lambda: np.einsum("ij,ij->i", self._X, self._X))
+
+    def mean(self) -> ArrayLike:
+        """
+        Get the means of the columns.
+
+        Returns:
+            mean (ArrayLike): A (nb_features, ) shape ArrayLike.
+        """
+        return self._cached("mean", lambda: self._X.mean(axis=0))
+
+    def var(self) -> ArrayLike:
+        """
+        Get the (biased) variances of the columns.
+
+        Returns:
+            var (ArrayLike): A (nb_features, ) shape ArrayLike.
+        """
+        return self._cached("var", lambda: ((self._X - self.mean()) ** 2).mean(axis=0))
+
+    def gram(self) -> ArrayLike:
+        """
+        Get the Gram matrix X^T*X.
+
+        Returns:
+            gram (ArrayLike): A (nb_features, nb_features) shape ArrayLike.
+        """
+        return self._cached("gram", lambda: self._X.T @ self._X)
+
+    def qr(self) -> Tuple[ArrayLike, ArrayLike]:
+        """
+        Get the reduced QR factorization of X.
+        Raise a numpy.linalg.LinAlgError if the qr factorization fails.
+
+        Returns:
+            Q (ArrayLike): A (nb_samples, nb_features) shape ArrayLike with orthonormal columns.
+            R (ArrayLike): A (nb_features, nb_features) shape upper triangular ArrayLike.
+        """
+        return self._cached("qr", lambda: np.linalg.qr(self._X))
+
+    def cholesky(self, shift: float = 0.) -> ArrayLike:
+        """
+        Get the Cholesky factor L of X^T*X + shift*I = L*L^T, cached for each shift.
+        Raise a numpy.linalg.LinAlgError if X^T*X + shift*I is not positive definite.
+
+        Parameters:
+            shift (float): A coefficient for the identity term, e.g. the ridge lambda.
+
+        Returns:
+            L (ArrayLike): A (nb_features, nb_features) shape lower triangular ArrayLike.
+        """
+        return self._cached(("cholesky", shift), lambda: np.linalg.cholesky(self.gram() + shift * np.eye(self._X.shape[1])))
+
+    def inverse_cholesky(self, shift: float = 0.) -> ArrayLike:
+        """
+        Get the inverse L^-1 of the Cholesky factor of X^T*X + shift*I, cached for each shift,
+        so (X^T*X + shift*I)^-1 = L^-T*L^-1 is applied with matrix products only.
+        Raise a numpy.linalg.LinAlgError if X^T*X + shift*I is not positive definite.
+
+        Parameters:
+            shift (float): A coefficient for the identity term, e.g. the ridge lambda.
+
+        Returns:
+            L_inv (ArrayLike): A (nb_features, nb_features) shape lower triangular ArrayLike.
+        """
+        return self._cached(("inverse_cholesky", shift), lambda: np.linalg.inv(self.cholesky(shift)))
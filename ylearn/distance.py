@@ -0,0 +1,366 @@
+"""Module for the distance metrics used by the neighbors estimators."""
+
+#Author: Youri Rigaud
+#License: MIT License
+
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Union
+import numpy as np
+
+from ylearn.types import ArrayLike
+from ylearn.dataset import Dataset
+
+class DistanceMetric(ABC):
+    """
+    Abstract class representing a batched distance metric.
+    A metric works on blocks of points and computes a reduced distance, a cheaper quantity
+    that keeps the same ranking as the true distance (e.g. the squared euclidean distance).
+
+    Attributes:
+        max_block_elements (int): The maximum number of elements of the (nb_queries, nb_samples, nb_features)
+            temporaries of the broadcasted metrics, the reference points are processed by chunks to respect it.
+    """
+
+    max_block_elements = 2 ** 22
+
+    def precompute(self, Y: Dataset) -> Dict[str, ArrayLike]:
+        """
+        Precompute the statistics of the reference points Y, computed once at fit time.
+
+        Parameters:
+            Y (Dataset): A (nb_samples, nb_features) shape Dataset representing the reference points.
+
+        Returns:
+            stats (Dict): A dictionary of the precomputed statistics, empty by default.
+        """
+        return {}
+
+    @abstractmethod
+    def reduced_distance(self, X: ArrayLike, Y: ArrayLike, stats: Dict[str, ArrayLike]) -> ArrayLike:
+        """
+        Compute the reduced distances beetween each point of X and each point of Y.
+
+        Parameters:
+            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike representing the queries.
+            Y (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the reference points.
+            stats (Dict): The statistics of Y returned by precompute.
+
+        Returns:
+            D (ArrayLike): A (nb_queries, nb_samples) shape ArrayLike of the reduced distances.
+        """
+        pass
+
+    def reduced_to_distance(self, D: ArrayLike) -> ArrayLike:
+        """
+        Convert reduced distances into true distances, identity by default.
+
+        Parameters:
+            D (ArrayLike): An ArrayLike of reduced distances.
+
+        Returns:
+            D (ArrayLike): An ArrayLike of true distances.
+        """
+        return D
+
+    def pairwise(self, X: ArrayLike, Y: ArrayLike) -> ArrayLike:
+        """
+        Compute the true distances beetween each point of X and each point of Y.
+
+        Parameters:
+            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike representing the queries.
+            Y (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the reference points.
+
+        Returns:
+            D (ArrayLike): A (nb_queries, nb_samples) shape ArrayLike of the distances.
+        """
+        return self.reduced_to_distance(self.reduced_distance(X, Y, self.precompute(Dataset.wrap(Y))))
+
+    def _broadcast_reduce(self, X: ArrayLike, Y: ArrayLike, reduce: Callable[[ArrayLike, ArrayLike], ArrayLike]) -> ArrayLike:
+        """
+        Apply a reduction over broadcasted (nb_queries, 1, nb_features) and (1, chunk_size, nb_features) shape blocks,
+        with chunks of reference points small enough to keep the temporaries under max_block_elements.
+
+        Parameters:
+            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike representing the queries.
+            Y (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the reference points.
+            reduce (Callable): The function reducing the broadcasted blocks over the last axis.
+
+        Returns:
+            D (ArrayLike): A (nb_queries, nb_samples) shape ArrayLike of the reduced values.
+        """
+        D = np.empty((X.shape[0], Y.shape[0]))
+        chunk_size = max(1, self.max_block_elements // max(1, X.shape[0] * X.shape[1]))
+        for start in range(0, Y.shape[0], chunk_size):
+            chunk = slice(start, start + chunk_size)
+            D[:, chunk] = reduce(X[:, np.newaxis, :], Y[np.newaxis, chunk, :])
+        return D
+
+class SquaredEuclideanDistance(DistanceMetric):
+    """
+    Squared euclidean distance, computed with ||x||^2 - 2*x.y + ||y||^2.
+    """
+
+    def precompute(self, Y: Dataset) -> Dict[str, ArrayLike]:
+        """
+        Precompute the squared norms of the rows of Y, cached on the Dataset.
+
+        Parameters:
+            Y (Dataset): A (nb_samples, nb_features) shape Dataset representing the reference points.
+
+        Returns:
+            stats (Dict): A dictionary with the (nb_samples, ) shape squared row norms under "sq_norms".
+        """
+        return {"sq_norms": Y.row_sq_norms()}
+
+    def reduced_distance(self, X: ArrayLike, Y: ArrayLike, stats: Dict[str, ArrayLike]) -> ArrayLike:
+        """
+        Compute the squared euclidean distances beetween each point of X and each point of Y.
+
+        Parameters:
+            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike representing the queries.
+            Y (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the reference points.
+            stats (Dict): The statistics of Y returned by precompute.
+
+        Returns:
+            D (ArrayLike): A (nb_queries, nb_samples) shape ArrayLike of the squared distances.
+        """
+        D = X @ Y.T
+        D *= -2.
+        D += np.einsum("ij,ij->i", X, X)[:, np.newaxis]
+        D += stats["sq_norms"][np.newaxis, :]
+        # rounding errors can give small negative values
+        np.maximum(D, 0., out=D)
+        return D
+
+class EuclideanDistance(SquaredEuclideanDistance):
+    """
+    Euclidean distance, the reduced distance is the squared euclidean distance.
+    """
+
+    def reduced_to_distance(self, D: ArrayLike) -> ArrayLike:
+        """
+        Convert squared euclidean distances into euclidean distances.
+
+        Parameters:
+            D (ArrayLike): An ArrayLike of squared euclidean distances.
+
+        Returns:
+            D (ArrayLike): An ArrayLike of euclidean distances.
+        """
+        return np.sqrt(D)
+
+class MinkowskiDistance(DistanceMetric):
+    """
+    Minkowski distance of order p, the reduced distance is sum(|x-y|^p) without the 1/p root.
+    """
+
+    def __init__(self, p: float = 2.) -> None:
+        """
+        Initialize the minkowski distance.
+
+        Parameters:
+            p (float): The order of the distance, must be greater or equal than 1.
+        """
+        if p < 1:
+            raise ValueError("Minkowski order 'p' must be greater or equal than 1.")
+        self.p = p
+
+    def reduced_distance(self, X: ArrayLike, Y: ArrayLike, stats: Dict[str, ArrayLike]) -> ArrayLike:
+        """
+        Compute the sum(|x-y|^p) beetween each point of X and each point of Y.
+
+        Parameters:
+            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike representing the queries.
+            Y (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the reference points.
+            stats (Dict): The statistics of Y returned by precompute.
+
+        Returns:
+            D (ArrayLike): A (nb_queries, nb_samples) shape ArrayLike of the reduced distances.
+        """
+        return self._broadcast_reduce(X, Y, lambda x, y: np.sum(np.abs(x - y) ** self.p, axis=-1))
+
+    def reduced_to_distance(self, D: ArrayLike) -> ArrayLike:
+        """
+        Convert reduced distances into minkowski distances.
+
+        Parameters:
+            D (ArrayLike): An ArrayLike of reduced distances.
+
+        Returns:
+            D (ArrayLike): An ArrayLike of minkowski distances.
+        """
+        return D ** (1. / self.p)
+
+class ManhattanDistance(MinkowskiDistance):
+    """
+    Manhattan distance, the minkowski distance of order 1.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the manhattan distance.
+        """
+        super().__init__(p=1.)
+
+    def reduced_distance(self, X: ArrayLike, Y: ArrayLike, stats: Dict[str, ArrayLike]) -> ArrayLike:
+        """
+        Compute the manhattan distances beetween each point of X and each point of Y.
+
+        Parameters:
+            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike representing the queries.
+            Y (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the reference points.
+            stats (Dict): The statistics of Y returned by precompute.
+
+        Returns:
+            D (ArrayLike): A (nb_queries, nb_samples) shape ArrayLike of the distances.
+        """
+        return self._broadcast_reduce(X, Y, lambda x, y: np.sum(np.abs(x - y), axis=-1))
+
+    def reduced_to_distance(self, D: ArrayLike) -> ArrayLike:
+        """
+        The reduced distance is already the manhattan distance.
+
+        Parameters:
+            D (ArrayLike): An ArrayLike of manhattan distances.
+
+        Returns:
+            D (ArrayLike): The same ArrayLike.
+        """
+        return D
+
+class CosineDistance(DistanceMetric):
+    """
+    Cosine distance 1 - x.y / (||x||*||y||), the norms of the reference points are cached at fit time.
+    """
+
+    def precompute(self, Y: Dataset) -> Dict[str, ArrayLike]:
+        """
+        Precompute the norms of the rows of Y from the squared norms cached on the Dataset.
+
+        Parameters:
+            Y (Dataset): A (nb_samples, nb_features) shape Dataset representing the reference points.
+
+        Returns:
+            stats (Dict): A dictionary with the (nb_samples, ) shape row norms under "norms".
+        """
+        return {"norms": np.sqrt(Y.row_sq_norms())}
+
+    def reduced_distance(self, X: ArrayLike, Y: ArrayLike, stats: Dict[str, ArrayLike]) -> ArrayLike:
+        """
+        Compute the cosine distances beetween each point of X and each point of Y.
+        A null vector has a cosine similarity of 0 with every point.
+
+        Parameters:
+            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike representing the queries.
+            Y (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the reference points.
+            stats (Dict): The statistics of Y returned by precompute.
+
+        Returns:
+            D (ArrayLike): A (nb_queries, nb_samples) shape ArrayLike of the distances.
+        """
+        X_norms = np.sqrt(np.einsum("ij,ij->i", X, X))
+        X_norms[X_norms == 0.] = 1.
+        Y_norms = np.where(stats["norms"] == 0., 1., stats["norms"])
+        D = X @ Y.T
+        D /= X_norms[:, np.newaxis]
+        D /= Y_norms[np.newaxis, :]
+        return 1. - D
+
+class CallableDistance(DistanceMetric):
+    """
+    Distance defined by a user callable, vectorized over blocks of points.
+    The callable receives a (nb_queries, 1, nb_features) and a (1, chunk_size, nb_features) shape ArrayLike
+    and must reduce over the last axis, like ylearn.utils.euclidean_distance.
+    """
+
+    def __init__(self, func: Callable[[ArrayLike, ArrayLike], ArrayLike]) -> None:
+        """
+        Initialize the callable distance.
+
+        Parameters:
+            func (Callable): The distance function.
+        """
+        self.func = func
+
+    def reduced_distance(self, X: ArrayLike, Y: ArrayLike, stats: Dict[str, ArrayLike]) -> ArrayLike:
+        """
+        Compute the distances beetween each point of X and each point of Y with the callable.
+
+        Parameters:
+            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike representing the queries.
+            Y (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the reference points.
+            stats (Dict): The statistics of Y returned by precompute.
+
+        Returns:
+            D (ArrayLike): A (nb_queries, nb_samples) shape ArrayLike of the distances.
+        """
+        return self._broadcast_reduce(X, Y, self._call)
+
+    def _call(self, x: ArrayLike, y: ArrayLike) -> ArrayLike:
+        """
+        Call the distance function on broadcasted blocks and check the shape of its result.
+
+        Parameters:
+            x (ArrayLike): A (nb_queries, 1, nb_features) shape ArrayLike.
+            y (ArrayLike): A (1, chunk_size, nb_features) shape ArrayLike.
+
+        Returns:
+            D (ArrayLike): A (nb_queries, chunk_size) shape ArrayLike of the distances.
+        """
+        D = np.asarray(self.func(x, y), dtype=float)
+        if D.shape != (x.shape[0], y.shape[1]):
+            raise ValueError(f"Distance callable must return a {(x.shape[0], y.shape[1])} shape ArrayLike, got {D.shape}.")
+        return D
+
+class DistanceMetricFactory:
+    """
+    The factory of all the distance metrics.
+
+    Attributes:
+        _metrics (Dict): A dictionary of all the metrics with their constructor.
+    """
+
+    _metrics = {
+        "euclidean": EuclideanDistance,
+        "sqeuclidean": SquaredEuclideanDistance,
+        "manhattan": ManhattanDistance,
+        "minkowski": MinkowskiDistance,
+        "cosine": CosineDistance,
+    }
+
+    @classmethod
+    def get(cls, metric: Union[str, Callable, DistanceMetric], **kwargs: Any) -> DistanceMetric:
+        """
+        Get the right metric.
+
+        Raise a ValueError if parameters are given with a callable or a metric object, they have no constructor to go to.
+
+        Parameters:
+            metric (str | Callable | DistanceMetric): The name of the metric (see _metrics attribut), a distance callable or a metric object.
+            kwargs (Any): The parameters of the metric constructor, e.g. p for minkowski, only with a metric name.
+
+        Returns:
+            metric (DistanceMetric): The metric object.
+        """
+        if kwargs and not isinstance(metric, str):
+            raise ValueError(f"Metric parameters {list(kwargs.keys())} are only supported with a metric name, got {type(metric).__name__}.")
+        if isinstance(metric, DistanceMetric):
+            return metric
+        if callable(metric):
+            return CallableDistance(metric)
+        if metric not in cls._metrics:
+            raise ValueError(f"Unknown metric '{metric}'. Available: {list(cls._metrics.keys())}")
+        return cls._metrics[metric](**kwargs)
+
+    @classmethod
+    def register(cls, name: str, metric: type) -> None:
+        """
+        Register a new metric constructor.
+
+        Parameters:
+            name (str): The name of the metric.
+            metric (type): A DistanceMetric subclass.
+        """
+        if not (isinstance(metric, type) and issubclass(metric, DistanceMetric)):
+            raise TypeError("A metric must be a DistanceMetric subclass.")
+        cls._metrics[name] = metric
@@ -5,38 +5,55 @@
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from collections import deque
+from typing import Optional, Union
 import numpy as np
 
 from ylearn.base import BaseEstimator
 from ylearn.types import ArrayLike
+from ylearn.dataset import Dataset
 from ylearn.metrics import r2_score
 from ylearn.linear_model.solver import LinearSolverFactory
 
 class BaseLinearModel(BaseEstimator, ABC):
     """
     Abstract class representing a linear model estimator.
+    The coefficients can be updated online with recursive least squares (see update and update_batch).
     """
     
-    def __init__(self, solver: str, fit_intercept: bool = True) -> None:
+    def __init__(self, solver: str, fit_intercept: bool = True, forgetting: float = 1.0, window: Optional[int] = None) -> None:
         """
         Initialize the linear model.
 
         Parameters:
+            solver (str): The name of the solver to use.
             fit_intercept (bool): True by default, fit the linear model with an intercept value stored in intercept_.
+            forgetting (float): 1.0 by default, the exponential forgetting factor of the online updates, in (0, 1].
+            window (int): None by default, the number of last observations kept by the online updates, at least the number of coefficients, the older ones are downdated.
         """
+        if not 0. < forgetting <= 1.:
+            raise ValueError("Forgetting factor 'forgetting' must be in (0, 1].")
+        if window is not None and window <= 0:
+            raise ValueError("Window size 'window' must be strictly positive.")
         self.solver_name = solver
         self.solver = LinearSolverFactory.get(solver)
         self.fit_intercept = fit_intercept
+        self.forgetting = forgetting
+        self.window = window
         self.coef_ = None
         self.intercept_ = 0.
+        self._scale = None
+        self._offset = None
+        self._reset_online()
     
     @abstractmethod
-    def fit(self, X_train: ArrayLike, y_train: ArrayLike) -> BaseLinearModel:
+    def fit(self, X_train: Union[ArrayLike, Dataset], y_train: ArrayLike) -> BaseLinearModel:
         """
         Train the linear model on data X to fit responses y.
+        Given a Dataset, the factorizations are cached on it and reused by the other models.
 
         Parameters:
-            X_train (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the training data.
+            X_train (ArrayLike | Dataset): A (nb_samples, nb_features) shape ArrayLike or Dataset representing the training data.
             y_train (ArrayLike): A (nb_samples, ) shape ArrayLike representing the responses of the training data.
         
         Returns:
@@ -44,6 +61,9 @@ class BaseLinearModel(BaseEstimator, ABC):
         """
         self._X_train = self._add_intercept(X_train)
         self._y_train = y_train
+        self._scale = None
+        self._offset = None
+        self._reset_online()
     
     def predict(self, X: ArrayLike) -> ArrayLike:
         """
@@ -55,9 +75,7 @@ class BaseLinearModel(BaseEstimator, ABC):
         Returns:
             y_pred (ArrayLike): The target values predicted by the KNN estimator.
         """
-        X = self._add_intercept(X)
-        params = np.concatenate(([self.intercept_], self.coef_)) if self.fit_intercept else self.coef_
-        return X @ params
+        return np.asarray(X) @ self.coef_ + self.intercept_
 
     def score(self, X: ArrayLike, y: ArrayLike) -> float:
         """
@@ -74,29 +92,220 @@ class BaseLinearModel(BaseEstimator, ABC):
         y_pred = self.predict(X)
         return r2_score(y, y_pred)
 
-    def _add_intercept(self, X: ArrayLike) -> ArrayLike:
+    def _add_intercept(self, X: Union[ArrayLike, Dataset]) -> Dataset:
         """
         Add an intercept column on X if fit_intercept is True.
+        The Dataset with the intercept column is cached on the Dataset of X.
 
         Parameters:
-            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing data to add an intercept column.
+            X (ArrayLike | Dataset): A (nb_samples, nb_features) shape ArrayLike or Dataset representing data to add an intercept column.
 
         Returns:
-            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing data with an intercept at the first column.
+            X (Dataset): A (nb_samples, nb_features) shape Dataset representing data with an intercept at the first column.
         """
+        X = Dataset.wrap(X)
         if self.fit_intercept:
-            X = np.hstack([np.ones((X.shape[0],1)), X])
+            X = X.with_intercept()
         return X
     
     def _set_coef(self, beta: ArrayLike) -> None:
         """
-        Set the coef and intercept from beta.
+        Set the coef and intercept from beta, with the folded scaler if any.
 
         Parameters:
             beta (ArrayLike): A (nb_features, ) or (nb_features+1, ) shape ArrayLike of the coefficients returned by the solver.
         """
+        self._beta = beta
         if self.fit_intercept:
             self.intercept_ = beta[0]
             self.coef_ = beta[1:]
         else:
+            self.intercept_ = 0.
             self.coef_ = beta
+        if self._scale is not None:
+            self.intercept_ = self._offset @ self.coef_ + self.intercept_
+            self.coef_ = self._scale * self.coef_
+
+    def _fold_scaler(self, scale: ArrayLike, offset: ArrayLike) -> None:
+        """
+        Fold an affine scaler X * scale + offset of the training data into coef_ and intercept_,
+        so the model predicts directly on the unscaled data:
+        (X * scale + offset) @ coef + intercept = X @ (scale * coef) + (offset @ coef + intercept).
+        The online updates keep working in the scaled space of the training data.
+
+        Parameters:
+            scale (ArrayLike): A (nb_features, ) shape ArrayLike of the scale of the scaler.
+            offset (ArrayLike): A (nb_features, ) shape ArrayLike of the offset of the scaler.
+        """
+        self._scale = scale
+        self._offset = offset
+        self._set_coef(self._beta)
+
+    def _to_fit_space(self, X: ArrayLike) -> ArrayLike:
+        """
+        Scale the new observations like the training data if a scaler is folded.
+
+        Parameters:
+            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the new observations.
+
+        Returns:
+            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike in the space of the training data.
+        """
+        X = np.asarray(X, dtype=float)
+        if self._scale is None:
+            return X
+        return X * self._scale + self._offset
+
+    def _penalty(self) -> float:
+        """
+        The coefficient of the identity term added to X^T*X, 0 for no regularization.
+
+        Returns:
+            penalty (float): The penalty coefficient.
+        """
+        return 0.
+
+    def update(self, x: ArrayLike, y: float) -> BaseLinearModel:
+        """
+        Update the coefficients with one new observation, with a Sherman-Morrison update of the inverse Gram matrix in O(p^2).
+        The previous observations are weighted by the forgetting factor, and the observations out of the window are downdated, at least the number of coefficients.
+        If the model is not fitted, the inverse Gram matrix starts from (penalty*I)^-1, or a large multiple of I without penalty.
+
+        Parameters:
+            x (ArrayLike): A (nb_features, ) shape ArrayLike representing the new observation.
+            y (float): The response of the new observation.
+
+        Returns:
+            self (BaseLinearModel): Self updated linear model.
+        """
+        z = self._add_intercept(self._to_fit_space(np.asarray(x, dtype=float).reshape(1, -1))).X[0]
+        self._init_online(z.shape[0])
+        self._update_row(z, float(y))
+        self._set_coef(self._w.copy())
+        return self
+
+    def update_batch(self, X: ArrayLike, y: ArrayLike) -> BaseLinearModel:
+        """
+        Update the coefficients with a batch of new observations, in the given order.
+        Without window, the batch is split in blocks of p observations, each one added with a rank-p Woodbury update
+        of the inverse Gram matrix in O(p^3), so O(p^2) per observation and O(p^2) memory whatever the batch size.
+        Otherwise the observations are updated one by one to downdate the ones out of the window.
+
+        Parameters:
+            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the new observations.
+            y (ArrayLike): A (nb_samples, ) shape ArrayLike representing the responses of the new observations.
+
+        Returns:
+            self (BaseLinearModel): Self updated linear model.
+        """
+        Z = self._add_intercept(self._to_fit_space(X)).X
+        y = np.asarray(y, dtype=float)
+        self._init_online(Z.shape[1])
+        if self.window is None:
+            block_size = Z.shape[1]
+            for start in range(0, Z.shape[0], block_size):
+                self._update_rank_k(Z[start:start + block_size], y[start:start + block_size])
+        else:
+            for z, y_i in zip(Z, y):
+                self._update_row(z, y_i)
+        self._set_coef(self._w.copy())
+        return self
+
+    def _reset_online(self) -> None:
+        """
+        Forget the online state, it is rebuilt from the training data at the next update.
+        """
+        self._P = None
+        self._w = None
+        self._t = 0
+        self._history = deque()
+
+    def _init_online(self, nb_params: int) -> None:
+        """
+        Build the online state at the first update: the inverse Gram matrix P = (X^T*X + penalty*I)^-1,
+        from the cached R factor of the training data (or its Cholesky factor with a penalty), and the coefficients.
+        Raise a ValueError if the window is smaller than the number of coefficients, the Gram matrix of the window would be singular.
+
+        Parameters:
+            nb_params (int): The number of coefficients, intercept included.
+        """
+        if self._P is not None:
+            return
+        if self.window is not None and self.window < nb_params:
+            raise ValueError(f"Window size 'window' must be greater or equal than the number of coefficients {nb_params}.")
+        if self.coef_ is None:
+            penalty = self._penalty()
+            self._P = np.eye(nb_params) / (penalty if penalty > 0. else 1e-8)
+            self._w = np.zeros(nb_params)
+            return
+        penalty = self._penalty()
+        if penalty > 0.:
+            L_inv = self._X_train.inverse_cholesky(penalty)
+            self._P = L_inv.T @ L_inv
+        else:
+            R_inv = np.linalg.inv(self._X_train.qr()[1])
+            self._P = R_inv @ R_inv.T
+        self._w = self._beta.copy()
+        if self.window is not None:
+            # the training observations are the oldest ones of the window
+            self._history.extend((z, y, 0) for z, y in zip(self._X_train.X, self._y_train))
+            while len(self._history) > self.window:
+                self._downdate_oldest()
+
+    def _update_row(self, z: ArrayLike, y: float) -> None:
+        """
+        Add one observation with the Sherman-Morrison formula, the previous ones are weighted by the forgetting factor.
+
+        Parameters:
+            z (ArrayLike): A (nb_params, ) shape ArrayLike representing the observation, intercept included.
+            y (float): The response of the observation.
+        """
+        Pz = self._P @ z
+        gain = Pz / (self.forgetting + z @ Pz)
+        self._w = self._w + gain * (y - z @ self._w)
+        self._set_P((self._P - np.outer(gain, Pz)) / self.forgetting)
+        self._t += 1
+        if self.window is not None:
+            self._history.append((z, y, self._t))
+            while len(self._history) > self.window:
+                self._downdate_oldest()
+
+    def _set_P(self, P: ArrayLike) -> None:
+        """
+        Set the inverse Gram matrix, symmetrized: with a forgetting factor below 1 the rounding errors
+        of the updates are amplified at each step and the asymmetric part of P grows until it diverges.
+
+        Parameters:
+            P (ArrayLike): A (nb_params, nb_params) shape ArrayLike of the updated inverse Gram matrix.
+        """
+        self._P = (P + P.T) / 2.
+
+    def _downdate_oldest(self) -> None:
+        """
+        Remove the oldest observation of the window with the Sherman-Morrison formula,
+        its weight is the forgetting factor to the power of its age.
+        """
+        z, y, t = self._history.popleft()
+        weight = self.forgetting ** (self._t - t)
+        Pz = self._P @ z
+        self._set_P(self._P + weight * np.outer(Pz, Pz) / (1. - weight * (z @ Pz)))
+        self._w = self._w - weight * (self._P @ z) * (y - z @ self._w)
+
+    def _update_rank_k(self, Z: ArrayLike, y: ArrayLike) -> None:
+        """
+        Add k observations with the Woodbury formula, the i-th one is weighted by forgetting^(k-1-i)
+        and the previous ones by forgetting^k:
+        P' = forgetting^-k * (P - P*Z^T*(forgetting^k*D^-1 + Z*P*Z^T)^-1*Z*P) and w' = w + P'*Z^T*D*(y - Z*w).
+
+        Parameters:
+            Z (ArrayLike): A (k, nb_params) shape ArrayLike representing the observations, intercept included.
+            y (ArrayLike): A (k, ) shape ArrayLike representing the responses of the observations.
+        """
+        k = Z.shape[0]
+        weights = self.forgetting ** np.arange(k - 1, -1, -1)
+        decay = self.forgetting ** k
+        PZt = self._P @ Z.T
+        S = np.diag(decay / weights) + Z @ PZt
+        self._set_P((self._P - PZt @ np.linalg.solve(S, PZt.T)) / decay)
+        self._w = self._w + self._P @ (Z.T @ (weights * (y - Z @ self._w)))
+        self._t += k
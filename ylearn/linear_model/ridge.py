@@ -4,9 +4,11 @@
 #License: MIT License
 
 from __future__ import annotations
+from typing import Optional, Union
 
 from ylearn.base import BaseEstimator
 from ylearn.types import ArrayLike
+from ylearn.dataset import Dataset
 from ylearn.linear_model import BaseLinearModel
 from ylearn.linear_model.solver import LinearSolverFactory
 
@@ -15,7 +17,7 @@ class Ridge(BaseLinearModel):
     Ridge linear model estimators.
     """
 
-    def __init__(self, lmbd: float = 1.0, solver="qr_ridge", fit_intercept = True) -> None:
+    def __init__(self, lmbd: float = 1.0, solver="qr_ridge", fit_intercept = True, forgetting: float = 1.0, window: Optional[int] = None) -> None:
         """
         Initialize the ridge linear model.
 
@@ -23,18 +25,20 @@ class Ridge(BaseLinearModel):
             lmbd (float): The lambda ridge coefficient.
             solver (str): The name of the solver to use.
             fit_intercept (bool): True by default, fit the linear model with an intercept value stored in intercept_.
+            forgetting (float): 1.0 by default, the exponential forgetting factor of the online updates, in (0, 1].
+            window (int): None by default, the number of last observations kept by the online updates, at least the number of coefficients.
         """
-        super().__init__(solver, fit_intercept)
+        super().__init__(solver, fit_intercept, forgetting, window)
         if lmbd <= 0:
             raise ValueError("Lambda value 'lmbd' must be strictly positive. Use OLS for the case lambda = 0.")
         self.lmbd = lmbd
 
-    def fit(self, X_train: ArrayLike, y_train: ArrayLike) -> Ridge:
+    def fit(self, X_train: Union[ArrayLike, Dataset], y_train: ArrayLike) -> Ridge:
         """
         Train the linear model on data X to fit responses y.
 
         Parameters:
-            X_train (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the training data.
+            X_train (ArrayLike | Dataset): A (nb_samples, nb_features) shape ArrayLike or Dataset representing the training data.
             y_train (ArrayLike): A (nb_samples, ) shape ArrayLike representing the responses of the training data.
         
         Returns:
@@ -44,3 +48,12 @@ class Ridge(BaseLinearModel):
         beta = self.solver.solve(self._X_train, self._y_train, lmbd=self.lmbd)
         self._set_coef(beta)
         return self
+
+    def _penalty(self) -> float:
+        """
+        The ridge penalty added to X^T*X.
+
+        Returns:
+            penalty (float): The lambda ridge coefficient.
+        """
+        return self.lmbd
@@ -4,9 +4,11 @@
 #License: MIT License
 
 from abc import ABC, abstractmethod
+from typing import Union
 import numpy as np
 
 from ylearn.types import ArrayLike
+from ylearn.dataset import Dataset
 
 class LinearSolver(ABC):
     """
@@ -14,12 +16,12 @@ class LinearSolver(ABC):
     """
 
     @abstractmethod
-    def solve(self, X: ArrayLike, y: ArrayLike, lmbd: float = 0.0) -> ArrayLike:
+    def solve(self, X: Union[ArrayLike, Dataset], y: ArrayLike, lmbd: float = 0.0) -> ArrayLike:
         """
         Solve the following linear equation: (X^T*X + lmbd*I)*w = X^T*Y.
 
         Parameters:
-            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike.
+            X (ArrayLike | Dataset): A (nb_samples, nb_features) shape ArrayLike, or a Dataset to reuse its cached factorizations.
             y (ArrayLike): A (nb_samples, ) shape ArrayLike.
             lmbd (float): A lambda coefficient for tuning the identity (I) term of the equation.
 
@@ -33,47 +35,47 @@ class NormalEquationSolver(LinearSolver):
     Linear solver for OLS and Ridge.
     """
 
-    def solve(self, X: ArrayLike, y: ArrayLike, lmbd: float = 0.0) -> ArrayLike:
+    def solve(self, X: Union[ArrayLike, Dataset], y: ArrayLike, lmbd: float = 0.0) -> ArrayLike:
         """
         Solve the following linear equation: (X^T*X + lmbd*I)*w = X^T*Y.
-        It uses the numpy linalg solver to resolve it.
-        X^T*X + lmbd*I should be invertible.
-        Raise a numpy.linalg.LinAlgError if X^T*X + lmbd*I is singular or not square,
+        It uses the cached inverse Cholesky factor of X^T*X + lmbd*I to resolve it with matrix products only.
+        X^T*X + lmbd*I should be positive definite.
+        Raise a numpy.linalg.LinAlgError if X^T*X + lmbd*I is not positive definite,
         so on look for other solvers.
 
         Parameters:
-            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike.
+            X (ArrayLike | Dataset): A (nb_samples, nb_features) shape ArrayLike, or a Dataset to reuse its cached factorizations.
             y (ArrayLike): A (nb_samples, ) shape ArrayLike.
             lmbd (float): A lambda coefficient for tuning the identity (I) term of the equation.
 
         Returns:
             w (ArrayLike): A (nb_features, ) shape ArrayLike that represents solution of the equation.
         """
-        nb_features = X.shape[1]
-        I = np.eye(nb_features)
-        return np.linalg.solve(X.T @ X + lmbd * I, X.T @ y)
+        X = Dataset.wrap(X)
+        L_inv = X.inverse_cholesky(lmbd)
+        return L_inv.T @ (L_inv @ (X.X.T @ y))
 
 class QRSolver(LinearSolver):
     """
     Linear solver for OLS only, the lambda coefficient does not impact the solve.
     """
 
-    def solve(self, X: ArrayLike, y: ArrayLike, lmbd: float = 0.0) -> ArrayLike:
+    def solve(self, X: Union[ArrayLike, Dataset], y: ArrayLike, lmbd: float = 0.0) -> ArrayLike:
         """
         Solve the following linear equation: X*w = Y.
-        It uses the numpy linalg qr decomposition and solver to resolve it.
+        It uses the cached numpy linalg qr decomposition and solver to resolve it.
         X can be singular.
         Raise a numpy.linalg.LinAlgError if the qr factorization fails.
 
         Parameters:
-            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike.
+            X (ArrayLike | Dataset): A (nb_samples, nb_features) shape ArrayLike, or a Dataset to reuse its cached factorizations.
             y (ArrayLike): A (nb_samples, ) shape ArrayLike.
             lmbd (float): A lambda coefficient for tuning the identity (I) term of the equation.
 
         Returns:
             w (ArrayLike): A (nb_features, ) shape ArrayLike that represents solution of the equation.
         """
-        Q, R = np.linalg.qr(X)
+        Q, R = Dataset.wrap(X).qr()
         return np.linalg.solve(R, Q.T @ y)
 
 class QRRidgeSolver(LinearSolver):
@@ -81,15 +83,15 @@ class QRRidgeSolver(LinearSolver):
     Linear solver for Ridge, could work for OLS but see QRSolver for better performances.
     """
 
-    def solve(self, X: ArrayLike, y: ArrayLike, lmbd: float = 0.0) -> ArrayLike:
+    def solve(self, X: Union[ArrayLike, Dataset], y: ArrayLike, lmbd: float = 0.0) -> ArrayLike:
         """
         Solve the following linear equation: (X^T*X + lmbd*I)*w = X^T*Y.S
-        It uses the numpy linalg qr decomposition of X and solver to resolve it.
+        It uses the cached numpy linalg qr decomposition of X and solver to resolve it.
         X can be singular.
         Raise a numpy.linalg.LinAlgError if the qr factorization fails.
 
         Parameters:
-            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike.
+            X (ArrayLike | Dataset): A (nb_samples, nb_features) shape ArrayLike, or a Dataset to reuse its cached factorizations.
             y (ArrayLike): A (nb_samples, ) shape ArrayLike.
             lmbd (float): A lambda coefficient for tuning the identity (I) term of the equation.
 
@@ -97,7 +99,7 @@ class QRRidgeSolver(LinearSolver):
             w (ArrayLike): A (nb_features, ) shape ArrayLike that represents solution of the equation.
         """
         nb_features = X.shape[1]
-        Q, R = np.linalg.qr(X)
+        Q, R = Dataset.wrap(X).qr()
         I = np.eye(nb_features)
 
         # Right term
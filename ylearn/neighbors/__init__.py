@@ -5,4 +5,6 @@
 
 from ylearn.neighbors.base_knn import BaseKNN
 from ylearn.neighbors.knn_classification import KNNClassifier
-from ylearn.neighbors.knn_regression import KNNRegressor
\ No newline at end of file
+from ylearn.neighbors.knn_regression import KNNRegressor
+from ylearn.neighbors.quantization import ProductQuantizer
+from ylearn.neighbors.cache import PredictionCache
@@ -5,82 +5,285 @@
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 import numpy as np
 
 from ylearn.base import BaseEstimator
 from ylearn.types import ArrayLike
-from ylearn.utils import euclidean_distance
+from ylearn.dataset import Dataset
+from ylearn.distance import DistanceMetric, DistanceMetricFactory, SquaredEuclideanDistance
+from ylearn.neighbors.quantization import ProductQuantizer
+from ylearn.neighbors.cache import PredictionCache
 
 class BaseKNN(BaseEstimator, ABC):
     """
     An abstract class representing a KNN model.
     """
 
-    def __init__(self, k: int = 3) -> None:
+    def __init__(self, k: int = 3, metric: Union[str, Callable, DistanceMetric] = "euclidean",
+                 metric_params: Optional[Dict[str, Any]] = None, block_size: int = 256,
+                 compression: Optional[str] = None, compression_params: Optional[Dict[str, Any]] = None,
+                 rerank: int = 0, cache_size: int = 0, cache_bytes: Optional[int] = None) -> None:
         """
         Initialize the KNN estimator.
 
         Parameters:
             k (int): The number of desired neighbors of the KNN model.
+            metric (str | Callable | DistanceMetric): The distance metric, see DistanceMetricFactory.
+            metric_params (Dict): The parameters of the metric constructor, e.g. {"p": 3} for minkowski, only with a metric name.
+            block_size (int): The number of queries processed at once, bounds the memory of the distance matrix.
+            compression (str): None by default, "pq" stores the training data as product quantization codes (euclidean metrics only).
+            compression_params (Dict): The parameters of the ProductQuantizer, e.g. {"n_subspaces": 8}.
+            rerank (int): 0 by default, the size of the shortlist of compressed neighbors re-ranked with the exact distance.
+                The training data is kept in memory if it is strictly positive.
+            cache_size (int): 0 by default, the maximum number of predictions kept in a LRU cache of exact repeated queries.
+            cache_bytes (int): None by default, the maximum number of bytes of the cached queries.
+                The prediction cache is enabled if cache_size or cache_bytes is set.
         """
         super().__init__()
+        if block_size <= 0:
+            raise ValueError("Block size 'block_size' must be strictly positive.")
         self.k = k
+        self.metric = DistanceMetricFactory.get(metric, **(metric_params or {}))
+        self.block_size = block_size
+        if compression not in (None, "pq"):
+            raise ValueError(f"Unknown compression '{compression}'. Available: [None, 'pq']")
+        if compression == "pq" and not isinstance(self.metric, SquaredEuclideanDistance):
+            raise ValueError("Compression 'pq' only supports the 'euclidean' and 'sqeuclidean' metrics.")
+        if rerank < 0:
+            raise ValueError("Shortlist size 'rerank' must be positive.")
+        self.compression = compression
+        self.compression_params = compression_params or {}
+        self.rerank = rerank
+        self._pq = None
+        self._codes = None
+        self._prediction_cache = PredictionCache(cache_size, cache_bytes) if cache_size > 0 or cache_bytes is not None else None
 
-    def fit(self, X_train: ArrayLike, y_train: ArrayLike) -> BaseKNN:
+    def fit(self, X_train: Union[ArrayLike, Dataset], y_train: ArrayLike) -> BaseKNN:
         """
         Train the KNN estimator on data X to fit target values y.
+        The statistics needed by the metric (e.g. row norms) are cached on the Dataset of X, and read back from it at prediction,
+        so a mutation of the Dataset after fit is taken into account.
+        With the "pq" compression, the codebooks are trained here and the training data is stored as codes.
+        The prediction cache is cleared here.
 
         Parameters:
-            X_train (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the training data.
+            X_train (ArrayLike | Dataset): A (nb_samples, nb_features) shape ArrayLike or Dataset representing the training data.
             y_train (ArrayLike): A (nb_samples, ) shape ArrayLike representing the target values of the training data.
         
         Returns:
             self (KNN): Self trained KNN estimator object.
         """
-        self._X_train = X_train
-        self._y_train = y_train
+        dataset = Dataset.wrap(X_train)
+        self._X_train = dataset.X
+        self._y_train = np.asarray(y_train)
+        self._n_features = self._X_train.shape[1]
+        self._train_dataset = dataset
+        self._train_version = dataset.version
+        self.metric.precompute(dataset)
+        if self.compression == "pq":
+            self._pq = ProductQuantizer(**self.compression_params).fit(self._X_train)
+            self._codes = self._pq.encode(self._X_train)
+            if self.rerank == 0:
+                # only the codes are needed without re-ranking
+                self._X_train = None
+                self._train_dataset = None
+        if self._prediction_cache is not None:
+            self._prediction_cache.clear()
         return self
     
-    def predict(self, X: ArrayLike) -> ArrayLike:
+    def predict(self, X: Union[ArrayLike, Dataset]) -> ArrayLike:
         """
         Predict the target values of the data X.
+        With the prediction cache, the whole batch is looked up first and only the misses are computed.
+        The prediction cache is cleared if the training Dataset was mutated since the last fit or clear.
 
         Parameters:
-            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike representing the queries data.
+            X (ArrayLike | Dataset): A (nb_queries, nb_features) shape ArrayLike or Dataset representing the queries data.
         
         Returns:
             y_pred (ArrayLike): The target values predicted by the KNN estimator.
         """
-        return np.array([self._predict(x) for x in X])
+        if self._prediction_cache is None:
+            k_nearest_target = self._compute_k_neighbors(X)
+            return self._predict(k_nearest_target)
+
+        # the cached predictions are stale if the training Dataset was mutated since they were computed
+        if self._train_dataset is not None and self._train_dataset.version != self._train_version:
+            self._prediction_cache.clear()
+            self._train_version = self._train_dataset.version
+
+        X = np.ascontiguousarray(X, dtype=float)
+        keys = [x.tobytes() for x in X]
+        y_pred = [self._prediction_cache.get(key) for key in keys]
+
+        # compute each missed query once, even if it is repeated in the batch
+        missed = {}
+        for i, (key, pred) in enumerate(zip(keys, y_pred)):
+            if pred is None and key not in missed:
+                missed[key] = i
+        if missed:
+            missed_indices = list(missed.values())
+            missed_pred = self._predict(self._compute_k_neighbors(X[missed_indices]))
+            for key, pred in zip(missed, missed_pred):
+                self._prediction_cache.put(key, pred)
+                missed[key] = pred
+            y_pred = [missed[key] if pred is None else pred for key, pred in zip(keys, y_pred)]
+        return np.array(y_pred)
+
+    def cache_info(self) -> Dict[str, int]:
+        """
+        Report the statistics of the prediction cache.
+
+        Returns:
+            info (Dict): The number of "hits", "misses", "entries" and "bytes" of the cache, empty if the cache is disabled.
+        """
+        return self._prediction_cache.info() if self._prediction_cache is not None else {}
 
     @abstractmethod
-    def _predict(self, x: ArrayLike) -> Any:
+    def _predict(self, k_nearest_target: ArrayLike) -> ArrayLike:
         """
-        Predict the target value of the point x.
+        Predict the target values of the queries from the target values of their k nearest neighbors.
 
         Parameters:
-            x (ArrayLike): A (nb_features, ) shape ArrayLike representing the x point.
+            k_nearest_target (ArrayLike): A (nb_queries, k) shape ArrayLike representing the target values of the k nearest neighbors.
         
         Returns:
-            pred (Any): The target value predicted by the KNN estimator.
+            y_pred (ArrayLike): A (nb_queries, ) shape ArrayLike of the target values predicted by the KNN estimator.
         """
         pass
 
-    def _compute_k_neighbors(self, x: ArrayLike) -> ArrayLike:
+    def _compute_k_neighbors(self, X: ArrayLike) -> ArrayLike:
         """
-        Find the k nearest neighbors of the point x and return their target values.
+        Find the k nearest neighbors of the points X and return their target values.
 
         Parameters:
-            x (ArrayLike): A (nb_features, ) shape ArrayLike representing a point.
+            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike representing the queries.
         
         Returns:
-            k_nearest_target (ArrayLike): A (k, ) shape ArrayLike representing the target values of the k nearest neighbors.
+            k_nearest_target (ArrayLike): A (nb_queries, k) shape ArrayLike representing the target values of the k nearest neighbors.
+        """
+        k_nearest_indices, _ = self._k_nearest_indices(X)
+        return self._y_train[k_nearest_indices]
+
+    def _k_nearest_indices(self, X: ArrayLike) -> Tuple[ArrayLike, ArrayLike]:
         """
-        # compute the distances with all training points
-        distances = np.array([euclidean_distance(x, x_train) for x_train in self._X_train])
+        Find the indices of the k nearest training points of each query, sorted by distance.
+        The ranking is done on the reduced distances of the metric (e.g. no sqrt for euclidean).
+
+        Parameters:
+            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike representing the queries.
 
-        # find the k nearest neighbors and their target values
-        k_nearest_indices = np.argsort(distances)[:self.k]
-        k_nearest_target = np.array([self._y_train[i] for i in k_nearest_indices])
-        return k_nearest_target
\ No newline at end of file
+        Returns:
+            k_nearest_indices (ArrayLike): A (nb_queries, k) shape ArrayLike of the indices in the training data.
+            k_nearest_distances (ArrayLike): A (nb_queries, k) shape ArrayLike of the reduced distances.
+        """
+        X = np.asarray(X, dtype=float)
+        k = min(self.k, self._y_train.shape[0])
+        stats = self._train_stats()
+        indices = np.empty((X.shape[0], k), dtype=np.intp)
+        distances = np.empty((X.shape[0], k))
+        for start in range(0, X.shape[0], self.block_size):
+            block = slice(start, start + self.block_size)
+            if self._codes is None:
+                D = self.metric.reduced_distance(X[block], self._X_train, stats)
+                indices[block], distances[block] = self._top_k(D, k)
+            else:
+                indices[block], distances[block] = self._compressed_k_nearest(X[block], k)
+        return indices, distances
+
+    def _train_stats(self) -> Dict[str, ArrayLike]:
+        """
+        Get the statistics of the training data needed by the metric, from the cache of the training Dataset.
+        They are recomputed only if the Dataset was mutated since they were last computed.
+
+        Returns:
+            stats (Dict): The statistics returned by the precompute method of the metric, empty without training data.
+        """
+        if self._train_dataset is None:
+            return {}
+        return self.metric.precompute(self._train_dataset)
+
+    def _compressed_k_nearest(self, X: ArrayLike, k: int) -> Tuple[ArrayLike, ArrayLike]:
+        """
+        Find the k nearest training points of each query with the asymmetric distances to the codes.
+        If rerank is strictly positive, a shortlist of rerank points is re-ranked with the exact squared distance.
+
+        Parameters:
+            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike representing the queries.
+            k (int): The number of neighbors.
+
+        Returns:
+            k_nearest_indices (ArrayLike): A (nb_queries, k) shape ArrayLike of the indices in the training data.
+            k_nearest_distances (ArrayLike): A (nb_queries, k) shape ArrayLike of the squared distances.
+        """
+        D = self._pq.asymmetric_distance(X, self._codes)
+        if self.rerank == 0:
+            return self._top_k(D, k)
+        shortlist, _ = self._top_k(D, max(self.rerank, k))
+        diff = X[:, np.newaxis, :] - self._X_train[shortlist]
+        D_shortlist = np.einsum("ijk,ijk->ij", diff, diff)
+        order, distances = self._top_k(D_shortlist, k)
+        return np.take_along_axis(shortlist, order, axis=1), distances
+
+    def memory_footprint(self) -> Dict[str, int]:
+        """
+        Report the memory footprint of the stored training data.
+
+        Returns:
+            footprint (Dict): The bytes of the raw training data ("raw"), of the codes ("codes"),
+                of the codebooks ("codebooks") and the ratio of the uncompressed float64 training data
+                against everything stored ("ratio"), the raw training data kept for re-ranking included.
+        """
+        uncompressed = self._y_train.shape[0] * self._n_features * np.dtype(float).itemsize
+        raw = self._X_train.nbytes if self._X_train is not None else 0
+        codes = self._codes.nbytes if self._codes is not None else 0
+        codebooks = self._pq.nbytes if self._pq is not None else 0
+        return {"raw": raw, "codes": codes, "codebooks": codebooks, "ratio": uncompressed / (raw + codes + codebooks)}
+
+    def compression_recall(self, X: ArrayLike, X_train: Optional[ArrayLike] = None) -> float:
+        """
+        Compute the recall of the k nearest neighbors found with the compression against the exact ones.
+
+        Parameters:
+            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike representing the queries.
+            X_train (ArrayLike): The training data used in fit, only needed if it is not kept in memory (rerank = 0).
+
+        Returns:
+            recall (float): The mean fraction of the exact k nearest neighbors found by the compressed search.
+        """
+        X = np.asarray(X, dtype=float)
+        X_train = self._X_train if X_train is None else np.asarray(X_train, dtype=float)
+        if X_train is None:
+            raise ValueError("The training data 'X_train' is needed to compute the exact neighbors.")
+        k = min(self.k, X_train.shape[0])
+        stats = self.metric.precompute(Dataset.wrap(X_train))
+        exact = np.empty((X.shape[0], k), dtype=np.intp)
+        for start in range(0, X.shape[0], self.block_size):
+            block = slice(start, start + self.block_size)
+            exact[block], _ = self._top_k(self.metric.reduced_distance(X[block], X_train, stats), k)
+        found, _ = self._k_nearest_indices(X)
+        return np.mean([len(np.intersect1d(e, f)) / k for e, f in zip(exact, found)])
+
+    @staticmethod
+    def _top_k(D: ArrayLike, k: int) -> Tuple[ArrayLike, ArrayLike]:
+        """
+        Select the k smallest values of each row of D, sorted in ascending order.
+
+        Parameters:
+            D (ArrayLike): A (nb_queries, nb_samples) shape ArrayLike of distances.
+            k (int): The number of values to select.
+
+        Returns:
+            indices (ArrayLike): A (nb_queries, k) shape ArrayLike of the selected column indices.
+            distances (ArrayLike): A (nb_queries, k) shape ArrayLike of the selected distances.
+        """
+        if k < D.shape[1]:
+            candidates = np.argpartition(D, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(D.shape[1]), D.shape)
+        candidate_distances = np.take_along_axis(D, candidates, axis=1)
+        # sort the candidates by distance, then by index for ties
+        order = np.lexsort((candidates, candidate_distances), axis=1)
+        indices = np.take_along_axis(candidates, order, axis=1)
+        return indices, np.take_along_axis(candidate_distances, order, axis=1)
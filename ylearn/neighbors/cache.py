@@ -0,0 +1,93 @@
+"""Module for the prediction cache of the KNN estimators."""
+
+#Author: Youri Rigaud
+#License: MIT License
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+class PredictionCache:
+    """
+    Bounded LRU cache of predictions, keyed by the bytes of the query rows so only exact repeats hit.
+    The least recently used entries are evicted when the number of entries or the number of bytes is exceeded.
+
+    Attributes:
+        hits (int): The number of lookups found in the cache.
+        misses (int): The number of lookups not found in the cache.
+    """
+
+    def __init__(self, max_entries: int = 0, max_bytes: Optional[int] = None) -> None:
+        """
+        Initialize the prediction cache.
+
+        Parameters:
+            max_entries (int): The maximum number of entries, 0 for no limit on the number of entries.
+            max_bytes (int): The maximum number of bytes of the keys, None for no limit on the bytes.
+        """
+        if max_entries < 0:
+            raise ValueError("Maximum number of entries 'max_entries' must be positive.")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("Maximum number of bytes 'max_bytes' must be strictly positive.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Remove all the entries and reset the statistics.
+        """
+        self._entries.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: bytes) -> Any:
+        """
+        Get the prediction of a query and mark it as recently used.
+
+        Parameters:
+            key (bytes): The bytes of the query row.
+
+        Returns:
+            pred (Any): The cached prediction, None if the query is not in the cache.
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: bytes, pred: Any) -> None:
+        """
+        Store the prediction of a query, evict the least recently used entries if needed.
+
+        Parameters:
+            key (bytes): The bytes of the query row.
+            pred (Any): The prediction of the query.
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        else:
+            self.nbytes += len(key)
+        self._entries[key] = pred
+        while self._entries and ((self.max_entries and len(self._entries) > self.max_entries)
+                                 or (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+            evicted, _ = self._entries.popitem(last=False)
+            self.nbytes -= len(evicted)
+
+    def __len__(self) -> int:
+        """
+        The number of entries.
+        """
+        return len(self._entries)
+
+    def info(self) -> Dict[str, int]:
+        """
+        Report the statistics of the cache.
+
+        Returns:
+            info (Dict): The number of "hits", "misses", "entries" and "bytes" of the cache.
+        """
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self.nbytes}
@@ -16,22 +16,19 @@ class KNNClassifier(BaseKNN):
     For the moment, only integer label are supported.
     """
 
-    def _predict(self, x: ArrayLike) -> int:
+    def _predict(self, k_nearest_target: ArrayLike) -> ArrayLike:
         """
-        Predict the label of the point x.
+        Predict the labels of the queries by majority vote.
 
         Parameters:
-            x (ArrayLike): A (nb_features, ) shape ArrayLike representing the x point.
+            k_nearest_target (ArrayLike): A (nb_queries, k) shape ArrayLike representing the labels of the k nearest neighbors.
         
         Returns:
-            pred (Any): The target value predicted by the KNN estimator.
+            y_pred (ArrayLike): A (nb_queries, ) shape ArrayLike of the labels predicted by the KNN estimator.
         """
-        # get the k nearest neighbors labels
-        k_nearest_label = self._compute_k_neighbors(x)
-
-        # get the most represented label
-        counts = np.bincount(k_nearest_label.astype(int))
-        return counts.argmax()
+        # get the most represented label of each query
+        k_nearest_label = k_nearest_target.astype(int)
+        return np.array([np.bincount(labels).argmax() for labels in k_nearest_label])
     
     def score(self, X: ArrayLike, y: ArrayLike) -> float:
         """
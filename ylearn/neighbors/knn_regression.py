@@ -15,21 +15,18 @@ class KNNRegressor(BaseKNN):
     KNN regressor model.
     """
 
-    def _predict(self, x: ArrayLike) -> int:
+    def _predict(self, k_nearest_target: ArrayLike) -> ArrayLike:
         """
-        Predict the target value of the point x.
+        Predict the target values of the queries by the mean of their neighbors.
 
         Parameters:
-            x (ArrayLike): A (nb_features, ) shape ArrayLike representing the x point.
+            k_nearest_target (ArrayLike): A (nb_queries, k) shape ArrayLike representing the target values of the k nearest neighbors.
         
         Returns:
-            pred (Any): The target value predicted by the KNN estimator.
+            y_pred (ArrayLike): A (nb_queries, ) shape ArrayLike of the target values predicted by the KNN estimator.
         """
-        # get the k nearest neighbors target values
-        k_nearest_target_values = self._compute_k_neighbors(x)
-
         # return the mean of the target values
-        return np.mean(k_nearest_target_values)
+        return np.mean(k_nearest_target, axis=1)
     
     def score(self, X: ArrayLike, y: ArrayLike) -> float:
         """
@@ -0,0 +1,173 @@
+"""Module for the product quantization of the KNN training data."""
+
+#Author: Youri Rigaud
+#License: MIT License
+
+from __future__ import annotations
+from typing import List, Optional
+import numpy as np
+
+from ylearn.types import ArrayLike
+
+def kmeans(X: ArrayLike, n_clusters: int, n_iter: int = 20, rng: Optional[np.random.Generator] = None) -> ArrayLike:
+    """
+    Compute the centroids of X with the Lloyd algorithm, initialized on random points of X.
+    An empty cluster keeps its previous centroid.
+
+    Parameters:
+        X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the data.
+        n_clusters (int): The number of centroids, must be lower or equal than nb_samples.
+        n_iter (int): The number of iterations.
+        rng (np.random.Generator): The random generator of the initialization.
+
+    Returns:
+        centroids (ArrayLike): A (n_clusters, nb_features) shape ArrayLike representing the centroids.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    centroids = X[rng.choice(X.shape[0], size=n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        labels = _nearest_centroid(X, centroids)
+        counts = np.bincount(labels, minlength=n_clusters)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, X)
+        not_empty = counts > 0
+        centroids[not_empty] = sums[not_empty] / counts[not_empty, np.newaxis]
+    return centroids
+
+def _nearest_centroid(X: ArrayLike, centroids: ArrayLike) -> ArrayLike:
+    """
+    Find the nearest centroid of each point of X.
+
+    Parameters:
+        X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the data.
+        centroids (ArrayLike): A (n_clusters, nb_features) shape ArrayLike representing the centroids.
+
+    Returns:
+        labels (ArrayLike): A (nb_samples, ) shape ArrayLike of the index of the nearest centroid.
+    """
+    # ||x||^2 is the same for all the centroids, so it does not change the ranking
+    D = -2. * (X @ centroids.T) + np.einsum("ij,ij->i", centroids, centroids)[np.newaxis, :]
+    return D.argmin(axis=1)
+
+class ProductQuantizer:
+    """
+    Product quantizer for the squared euclidean distance.
+    The features are split into m subspaces, and each subspace is quantized with its own codebook
+    of at most 256 centroids, so a point is stored as m uint8 codes.
+
+    Attributes:
+        codebooks_ (List[ArrayLike]): The (nb_centroids, subspace_size) shape codebook of each subspace.
+        subspaces_ (List[ArrayLike]): The feature indices of each subspace.
+    """
+
+    def __init__(self, n_subspaces: int = 8, n_centroids: int = 256, n_iter: int = 20, random_state: Optional[int] = None) -> None:
+        """
+        Initialize the product quantizer.
+
+        Parameters:
+            n_subspaces (int): The number m of subspaces, i.e. the number of codes of a point.
+            n_centroids (int): The number of centroids of each codebook, at most 256 to fit in uint8.
+            n_iter (int): The number of kmeans iterations to train the codebooks.
+            random_state (int): The seed of the kmeans initialization.
+        """
+        if n_subspaces <= 0:
+            raise ValueError("Number of subspaces 'n_subspaces' must be strictly positive.")
+        if not 1 <= n_centroids <= 256:
+            raise ValueError("Number of centroids 'n_centroids' must be beetween 1 and 256.")
+        self.n_subspaces = n_subspaces
+        self.n_centroids = n_centroids
+        self.n_iter = n_iter
+        self.random_state = random_state
+        self.codebooks_: List[ArrayLike] = []
+        self.subspaces_: List[ArrayLike] = []
+
+    def fit(self, X: ArrayLike) -> ProductQuantizer:
+        """
+        Train the codebooks of each subspace on data X.
+
+        Parameters:
+            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the data.
+
+        Returns:
+            self (ProductQuantizer): Self trained product quantizer object.
+        """
+        if self.n_subspaces > X.shape[1]:
+            raise ValueError(f"Number of subspaces 'n_subspaces' must be lower or equal than the number of features ({X.shape[1]}).")
+        rng = np.random.default_rng(self.random_state)
+        n_centroids = min(self.n_centroids, X.shape[0])
+        self.subspaces_ = np.array_split(np.arange(X.shape[1]), self.n_subspaces)
+        self.codebooks_ = [kmeans(X[:, subspace], n_centroids, self.n_iter, rng) for subspace in self.subspaces_]
+        return self
+
+    def encode(self, X: ArrayLike) -> ArrayLike:
+        """
+        Encode the points of X with the index of their nearest centroid in each subspace.
+
+        Parameters:
+            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the data.
+
+        Returns:
+            codes (ArrayLike): A (nb_samples, n_subspaces) shape uint8 ArrayLike of the codes.
+        """
+        codes = np.empty((X.shape[0], self.n_subspaces), dtype=np.uint8)
+        for j, (subspace, codebook) in enumerate(zip(self.subspaces_, self.codebooks_)):
+            codes[:, j] = _nearest_centroid(X[:, subspace], codebook)
+        return codes
+
+    def decode(self, codes: ArrayLike) -> ArrayLike:
+        """
+        Reconstruct the approximated points from their codes.
+
+        Parameters:
+            codes (ArrayLike): A (nb_samples, n_subspaces) shape uint8 ArrayLike of the codes.
+
+        Returns:
+            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the approximated points.
+        """
+        X = np.empty((codes.shape[0], sum(len(subspace) for subspace in self.subspaces_)))
+        for j, (subspace, codebook) in enumerate(zip(self.subspaces_, self.codebooks_)):
+            X[:, subspace] = codebook[codes[:, j]]
+        return X
+
+    def lookup_tables(self, X: ArrayLike) -> List[ArrayLike]:
+        """
+        Compute the squared euclidean distances beetween the queries and the centroids of each subspace.
+
+        Parameters:
+            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike representing the queries.
+
+        Returns:
+            tables (List[ArrayLike]): The (nb_queries, nb_centroids) shape lookup table of each subspace.
+        """
+        tables = []
+        for subspace, codebook in zip(self.subspaces_, self.codebooks_):
+            X_sub = X[:, subspace]
+            table = -2. * (X_sub @ codebook.T)
+            table += np.einsum("ij,ij->i", X_sub, X_sub)[:, np.newaxis]
+            table += np.einsum("ij,ij->i", codebook, codebook)[np.newaxis, :]
+            tables.append(table)
+        return tables
+
+    def asymmetric_distance(self, X: ArrayLike, codes: ArrayLike) -> ArrayLike:
+        """
+        Compute the approximated squared euclidean distances beetween the queries and the encoded points,
+        by summing the lookup table values of the codes (asymmetric distance computation).
+
+        Parameters:
+            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike representing the queries.
+            codes (ArrayLike): A (nb_samples, n_subspaces) shape uint8 ArrayLike of the codes.
+
+        Returns:
+            D (ArrayLike): A (nb_queries, nb_samples) shape ArrayLike of the approximated squared distances.
+        """
+        D = np.zeros((X.shape[0], codes.shape[0]))
+        for j, table in enumerate(self.lookup_tables(X)):
+            D += table[:, codes[:, j]]
+        return D
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The memory footprint of the codebooks in bytes.
+        """
+        return sum(codebook.nbytes for codebook in self.codebooks_)
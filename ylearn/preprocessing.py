@@ -0,0 +1,406 @@
+"""Module for the preprocessing of the data."""
+
+#Author: Youri Rigaud
+#License: MIT License
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Union
+import numpy as np
+
+from ylearn.base import BaseEstimator
+from ylearn.types import ArrayLike
+from ylearn.dataset import Dataset
+from ylearn.linear_model import BaseLinearModel
+
+class BaseScaler(ABC):
+    """
+    Abstract class representing a feature scaler.
+    Every scaler is an affine transformation of the features: X_scaled = X * scale_ + offset_.
+    The statistics are fitted in a streaming way with partial_fit and can be merged across chunks.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the scaler.
+        """
+        self._reset()
+
+    def fit(self, X: ArrayLike) -> BaseScaler:
+        """
+        Fit the scaler on data X, forget the previously fitted statistics.
+
+        Parameters:
+            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the data.
+
+        Returns:
+            self (BaseScaler): Self fitted scaler object.
+        """
+        self._reset()
+        return self.partial_fit(X)
+
+    @abstractmethod
+    def partial_fit(self, X: ArrayLike) -> BaseScaler:
+        """
+        Update the statistics of the scaler with a chunk of data X.
+
+        Parameters:
+            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing a chunk of data.
+
+        Returns:
+            self (BaseScaler): Self fitted scaler object.
+        """
+        pass
+
+    @abstractmethod
+    def merge(self, other: BaseScaler) -> BaseScaler:
+        """
+        Merge the statistics of another scaler fitted on another chunk of data.
+
+        Parameters:
+            other (BaseScaler): A scaler of the same type.
+
+        Returns:
+            self (BaseScaler): Self scaler object with the merged statistics.
+        """
+        pass
+
+    @abstractmethod
+    def _reset(self) -> None:
+        """
+        Reset the fitted statistics.
+        """
+        pass
+
+    def transform(self, X: Union[ArrayLike, Dataset], copy: bool = True) -> Union[ArrayLike, Dataset]:
+        """
+        Scale the data X.
+
+        Parameters:
+            X (ArrayLike | Dataset): A (nb_samples, nb_features) shape ArrayLike or Dataset representing the data.
+            copy (bool): True by default, if False and X is a writeable float ArrayLike, X is scaled in place,
+                and if False and X is a Dataset, it is mutated through the Dataset so its caches are invalidated.
+                Otherwise the scaled data is written in a single new ArrayLike, without an intermediate copy of X.
+
+        Returns:
+            X_scaled (ArrayLike | Dataset): A (nb_samples, nb_features) shape ArrayLike representing the scaled data,
+                or the mutated Dataset.
+        """
+        self._check_is_fitted()
+        if isinstance(X, Dataset):
+            return self._set_dataset(X, self.transform(X.X), copy)
+        X = np.asarray(X, dtype=float)
+        X = np.multiply(X, self.scale_, out=X if not copy and X.flags.writeable else None)
+        X += self.offset_
+        return X
+
+    def inverse_transform(self, X: Union[ArrayLike, Dataset], copy: bool = True) -> Union[ArrayLike, Dataset]:
+        """
+        Scale back the data X to the original space.
+
+        Parameters:
+            X (ArrayLike | Dataset): A (nb_samples, nb_features) shape ArrayLike or Dataset representing the scaled data.
+            copy (bool): True by default, if False and X is a writeable float ArrayLike, X is scaled in place,
+                and if False and X is a Dataset, it is mutated through the Dataset so its caches are invalidated.
+                Otherwise the data is written in a single new ArrayLike, without an intermediate copy of X.
+
+        Returns:
+            X (ArrayLike | Dataset): A (nb_samples, nb_features) shape ArrayLike representing the data,
+                or the mutated Dataset.
+        """
+        self._check_is_fitted()
+        if isinstance(X, Dataset):
+            return self._set_dataset(X, self.inverse_transform(X.X), copy)
+        X = np.asarray(X, dtype=float)
+        X = np.subtract(X, self.offset_, out=X if not copy and X.flags.writeable else None)
+        X /= self.scale_
+        return X
+
+    def _set_dataset(self, dataset: Dataset, X: ArrayLike, copy: bool) -> Union[ArrayLike, Dataset]:
+        """
+        Return the transformed data of a Dataset, written into the Dataset if copy is False.
+        The data of a Dataset is read only, so it is mutated through __setitem__ to invalidate its caches.
+
+        Parameters:
+            dataset (Dataset): The transformed Dataset.
+            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the transformed data.
+            copy (bool): If False, X is written into the Dataset.
+
+        Returns:
+            X (ArrayLike | Dataset): The transformed ArrayLike if copy is True, otherwise the mutated Dataset.
+        """
+        if copy:
+            return X
+        dataset[...] = X
+        return dataset
+
+    def fit_transform(self, X: ArrayLike) -> ArrayLike:
+        """
+        Fit the scaler on data X and scale it.
+
+        Parameters:
+            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the data.
+
+        Returns:
+            X_scaled (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the scaled data.
+        """
+        return self.fit(X).transform(X)
+
+    def _check_is_fitted(self) -> None:
+        """
+        Raise a ValueError if the scaler is not fitted.
+        """
+        if self.scale_ is None:
+            raise ValueError(f"This {type(self).__name__} is not fitted yet. Call 'fit' or 'partial_fit' first.")
+
+    def _check_merge(self, other: BaseScaler) -> None:
+        """
+        Raise a TypeError if the other scaler can not be merged with this one.
+
+        Parameters:
+            other (BaseScaler): The scaler to merge.
+        """
+        if type(other) is not type(self):
+            raise TypeError(f"Can not merge a {type(other).__name__} into a {type(self).__name__}.")
+
+class StandardScaler(BaseScaler):
+    """
+    Scale the features to zero mean and unit variance.
+    Mean and variance are updated in a single pass over the chunks (Chan et al. parallel algorithm).
+    """
+
+    def _reset(self) -> None:
+        """
+        Reset the fitted statistics.
+        """
+        self.n_samples_seen_ = 0
+        self.mean_ = None
+        self.var_ = None
+        self._M2 = None
+        self.scale_ = None
+        self.offset_ = None
+
+    def partial_fit(self, X: Union[ArrayLike, Dataset]) -> StandardScaler:
+        """
+        Update the mean and variance with a chunk of data X, an empty chunk changes nothing.
+        Given a Dataset, its cached column means and variances are used.
+
+        Parameters:
+            X (ArrayLike | Dataset): A (nb_samples, nb_features) shape ArrayLike or Dataset representing a chunk of data.
+
+        Returns:
+            self (StandardScaler): Self fitted scaler object.
+        """
+        X = Dataset.wrap(X)
+        if len(X) == 0:
+            return self
+        self._update(len(X), X.mean(), X.var() * len(X))
+        return self
+
+    def merge(self, other: StandardScaler) -> StandardScaler:
+        """
+        Merge the mean and variance of another standard scaler fitted on another chunk of data.
+
+        Parameters:
+            other (StandardScaler): A standard scaler.
+
+        Returns:
+            self (StandardScaler): Self scaler object with the merged statistics.
+        """
+        self._check_merge(other)
+        if other.n_samples_seen_ > 0:
+            self._update(other.n_samples_seen_, other.mean_, other._M2)
+        return self
+
+    def _update(self, n: int, mean: ArrayLike, M2: ArrayLike) -> None:
+        """
+        Combine the current statistics with the statistics of a chunk.
+
+        Parameters:
+            n (int): The number of samples of the chunk.
+            mean (ArrayLike): A (nb_features, ) shape ArrayLike of the mean of the chunk.
+            M2 (ArrayLike): A (nb_features, ) shape ArrayLike of the sum of squared deviations of the chunk.
+        """
+        if self.n_samples_seen_ == 0:
+            self.mean_, self._M2 = mean.copy(), M2.copy()
+        else:
+            n_total = self.n_samples_seen_ + n
+            delta = mean - self.mean_
+            self.mean_ = self.mean_ + delta * n / n_total
+            self._M2 = self._M2 + M2 + delta ** 2 * self.n_samples_seen_ * n / n_total
+        self.n_samples_seen_ += n
+        self.var_ = self._M2 / self.n_samples_seen_
+
+        # constant features are only centered
+        std = np.sqrt(self.var_)
+        std[std == 0.] = 1.
+        self.scale_ = 1. / std
+        self.offset_ = -self.mean_ * self.scale_
+
+class MinMaxScaler(BaseScaler):
+    """
+    Scale the features to a given range, [0, 1] by default.
+    """
+
+    def __init__(self, feature_range: tuple = (0., 1.)) -> None:
+        """
+        Initialize the min max scaler.
+
+        Parameters:
+            feature_range (tuple): The (min, max) range of the scaled features.
+        """
+        if feature_range[0] >= feature_range[1]:
+            raise ValueError("Minimum of 'feature_range' must be strictly smaller than its maximum.")
+        self.feature_range = feature_range
+        super().__init__()
+
+    def _reset(self) -> None:
+        """
+        Reset the fitted statistics.
+        """
+        self.n_samples_seen_ = 0
+        self.data_min_ = None
+        self.data_max_ = None
+        self.scale_ = None
+        self.offset_ = None
+
+    def partial_fit(self, X: ArrayLike) -> MinMaxScaler:
+        """
+        Update the minimum and maximum with a chunk of data X, an empty chunk changes nothing.
+
+        Parameters:
+            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing a chunk of data.
+
+        Returns:
+            self (MinMaxScaler): Self fitted scaler object.
+        """
+        X = np.asarray(X, dtype=float)
+        if X.shape[0] == 0:
+            return self
+        self._update(X.shape[0], X.min(axis=0), X.max(axis=0))
+        return self
+
+    def merge(self, other: MinMaxScaler) -> MinMaxScaler:
+        """
+        Merge the minimum and maximum of another min max scaler fitted on another chunk of data.
+
+        Parameters:
+            other (MinMaxScaler): A min max scaler.
+
+        Returns:
+            self (MinMaxScaler): Self scaler object with the merged statistics.
+        """
+        self._check_merge(other)
+        if other.n_samples_seen_ > 0:
+            self._update(other.n_samples_seen_, other.data_min_, other.data_max_)
+        return self
+
+    def _update(self, n: int, data_min: ArrayLike, data_max: ArrayLike) -> None:
+        """
+        Combine the current statistics with the statistics of a chunk.
+
+        Parameters:
+            n (int): The number of samples of the chunk.
+            data_min (ArrayLike): A (nb_features, ) shape ArrayLike of the minimum of the chunk.
+            data_max (ArrayLike): A (nb_features, ) shape ArrayLike of the maximum of the chunk.
+        """
+        if self.n_samples_seen_ == 0:
+            self.data_min_, self.data_max_ = data_min.copy(), data_max.copy()
+        else:
+            self.data_min_ = np.minimum(self.data_min_, data_min)
+            self.data_max_ = np.maximum(self.data_max_, data_max)
+        self.n_samples_seen_ += n
+
+        # constant features are only shifted
+        data_range = self.data_max_ - self.data_min_
+        data_range[data_range == 0.] = 1.
+        range_min, range_max = self.feature_range
+        self.scale_ = (range_max - range_min) / data_range
+        self.offset_ = range_min - self.data_min_ * self.scale_
+
+class Pipeline(BaseEstimator):
+    """
+    Estimator that scales the features before the underlying estimator.
+    For linear models, the scaler is folded into coef_ and intercept_ at fit time, so the prediction scales nothing.
+    For other estimators (e.g. KNN), the training data is scaled once at fit time and each query is scaled with one transform.
+    The queries are written in a new ArrayLike by default so the caller data is never mutated,
+    use copy=False to scale them in place without any allocation.
+    """
+
+    def __init__(self, scaler: BaseScaler, estimator: BaseEstimator, copy: bool = True) -> None:
+        """
+        Initialize the pipeline.
+
+        Parameters:
+            scaler (BaseScaler): The scaler of the features.
+            estimator (BaseEstimator): The estimator fitted on the scaled features.
+            copy (bool): True by default, the queries are scaled into a new ArrayLike (safe default).
+                If False, the float queries are scaled in place at prediction, so the input ArrayLike or Dataset is mutated.
+        """
+        self.scaler = scaler
+        self.estimator = estimator
+        self.copy = copy
+        self.folded_ = False
+
+    def fit(self, X_train: ArrayLike, y_train: ArrayLike) -> Pipeline:
+        """
+        Fit the scaler, then train the estimator on the scaled data X to fit target values y.
+
+        Parameters:
+            X_train (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the training data.
+            y_train (ArrayLike): A (nb_samples, ) shape ArrayLike representing the target values of the training data.
+
+        Returns:
+            self (Pipeline): Self trained pipeline object.
+        """
+        X_scaled = self.scaler.fit_transform(X_train)
+        self.estimator.fit(X_scaled, y_train)
+        self.folded_ = isinstance(self.estimator, BaseLinearModel)
+        if self.folded_:
+            self._fold_scaler()
+        return self
+
+    def predict(self, X: ArrayLike) -> ArrayLike:
+        """
+        Predict the target values of the data X.
+
+        Parameters:
+            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike representing the queries data.
+
+        Returns:
+            y_pred (ArrayLike): The target values predicted by the estimator.
+        """
+        return self.estimator.predict(self._transform(X))
+
+    def score(self, X: ArrayLike, y: ArrayLike) -> float:
+        """
+        Score the pipeline on the test data with the scorer of the estimator.
+
+        Parameters:
+            X (ArrayLike): A (nb_samples, nb_features) shape ArrayLike representing the test data.
+            y (ArrayLike): A (nb_samples, ) shape ArrayLike representing the true target values of the test data.
+
+        Returns:
+            score (float): The computed score.
+        """
+        return self.estimator.score(self._transform(X), y)
+
+    def _transform(self, X: ArrayLike) -> ArrayLike:
+        """
+        Scale the queries, nothing to do if the scaler is folded into the estimator.
+
+        Parameters:
+            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike representing the queries data.
+
+        Returns:
+            X (ArrayLike): A (nb_queries, nb_features) shape ArrayLike ready for the estimator.
+        """
+        if self.folded_:
+            return X
+        return self.scaler.transform(X, copy=self.copy)
+
+    def _fold_scaler(self) -> None:
+        """
+        Fold the scaler into the linear model, so it predicts directly on the unscaled data.
+        """
+        self.estimator._fold_scaler(self.scaler.scale_, self.scaler.offset_)
@@ -10,6 +10,7 @@ from ylearn.types import ArrayLike
 def euclidean_distance(x1: ArrayLike, x2: ArrayLike) -> float:
     """
     Compute the euclidean distance beetween x1 and x2.
+    The sum is done over the last axis, so it also works on broadcasted blocks of points.
 
         Parameters:
             x1 (ArrayLike): A (nb_features, ) shape ArrayLike representing a point.
@@ -18,5 +19,5 @@ def euclidean_distance(x1: ArrayLike, x2: ArrayLike) -> float:
         Returns:
             distance (float): The euclidean distance of x1 and x2.
     """
-    distance = np.sqrt(np.sum((x1-x2)**2))
+    distance = np.sqrt(np.sum((x1-x2)**2, axis=-1))
     return distance
\ No newline at end of file